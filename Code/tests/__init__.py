@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tests of the tetris package, run with python -m pytest from the Code folder.
+"""
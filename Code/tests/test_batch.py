@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""
+The batched engine against one engine.Engine per board.
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from tetris.ai import Bot
+from tetris.batch import BatchEngine
+from tetris.bitboard import BitBoard
+from tetris.engine import Engine
+from tetris.randomizer import SHAPES
+
+def board_masks(engine):
+    """
+    Returns the occupied cells of every row of an engine's board as bitmasks
+
+    Parameters
+    ----------
+    engine : Engine object
+        the game
+
+    Returns
+    -------
+    list
+    """
+    return [sum(1 << x for x, cell in enumerate(row) if cell) for row in engine.field_data]
+
+@pytest.mark.parametrize('kind', ['bag', 'uniform'])
+def test_steps_match_engine(kind):
+    num_boards = 16
+    batch = BatchEngine(num_boards, seed = 1, kind = kind)
+    # every engine is dealt the shape the batch spawned for its board
+    engines = [Engine(lambda n = n: SHAPES[batch.shape[n]], board = BitBoard(),
+                      first_shape = SHAPES[batch.shape[n]]) for n in range(num_boards)]
+    # the bot plays every engine, so rows fill and clear, and the batch is
+    # given the same actions
+    bots = [Bot(lookahead = 0) for n in range(num_boards)]
+
+    for step in range(1500):
+        actions = np.array([bot.next_action(engine, ()) for bot, engine in zip(bots, engines)])
+        batch.step(actions)
+        for n, engine in enumerate(engines):
+            if not engine.game_over:
+                engine.act(actions[n])
+
+        for n, engine in enumerate(engines):
+            message = "step {}, board {}".format(step, n)
+            assert engine.game_over == batch.game_over[n], message
+            assert board_masks(engine) == list(batch.boards[n]), message
+            assert (engine.current_score, engine.current_lines, engine.current_level) == \
+                (batch.score[n], batch.lines[n], batch.level[n]), message
+            if not engine.game_over:
+                piece = engine.piece
+                assert (piece.shape, piece.rotation, piece.x, piece.y) == \
+                    (SHAPES[batch.shape[n]], batch.rotation[n], batch.x[n], batch.y[n]), message
+
+    assert batch.lines.sum() > 0
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""
+Row and column counters of the boards against a full rescan of their cells.
+"""
+
+from random import Random
+
+import pytest
+
+from tetris.bitboard import BitBoard
+from tetris.engine import Board
+
+def rescan(board):
+    """
+    Counts the occupied cells of every row and the height and holes of every
+    column from the cells themselves
+
+    Parameters
+    ----------
+    board : Board or BitBoard object
+        the playing field
+
+    Returns
+    -------
+    row_counts : list
+    column_heights : list
+    column_holes : list
+    """
+    field = board.field_data
+    row_counts = [sum(1 for x in range(board.columns) if field[y][x])
+                  for y in range(board.rows)]
+    column_heights = []
+    column_holes = []
+    for x in range(board.columns):
+        top = next((y for y in range(board.rows) if field[y][x]), board.rows)
+        column_heights.append(board.rows - top)
+        column_holes.append(sum(1 for y in range(top, board.rows) if not field[y][x]))
+
+    return row_counts, column_heights, column_holes
+
+@pytest.mark.parametrize('board_class', [Board, BitBoard])
+@pytest.mark.parametrize('seed', range(20))
+def test_counters_match_rescan(board_class, seed):
+    rng = Random(seed)
+    board = board_class()
+    for step in range(60):
+        if rng.random() < 0.3:
+            # fill a few low rows, touching or not, so they clear together
+            full_rows = rng.sample(range(board.rows // 2, board.rows), rng.randint(1, 4))
+            cells = [(x, y) for y in full_rows for x in range(board.columns)
+                     if not board.field_data[y][x]]
+        else:
+            cells = [(rng.randrange(board.columns), rng.randrange(board.rows))
+                     for block in range(4)]
+        board.place(cells, rng.choice('TOJLISZ'))
+        board.check_row({y for x, y in cells} if rng.random() < 0.5 else None)
+
+        counters = (board.row_counts, board.column_heights, board.column_holes)
+        assert counters == rescan(board), "step {}".format(step)
+
+    board.clear()
+    assert (board.row_counts, board.column_heights, board.column_holes) == rescan(board)
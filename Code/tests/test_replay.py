@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+Replays through their binary form and back into a game.
+"""
+
+from random import Random
+
+import pytest
+
+from tetris.engine import Board
+from tetris.replay import Replay, ReplayRecorder, simulate
+from tetris.simulation import Simulation
+from tetris.timing import SimulationClock
+
+def record_game(seed, steps):
+    """
+    Plays a game with random keys, recording every step
+
+    Parameters
+    ----------
+    seed : int
+        seed of the shapes and the keys
+    steps : int
+        most steps to play
+
+    Returns
+    -------
+    simulation : Simulation object
+        the game after its last step
+    replay : Replay object
+        the recorded game
+    """
+    rng = Random(seed)
+    recorder = ReplayRecorder('bag', seed)
+    replay = recorder.replay
+    simulation = Simulation(replay.make_shape_queue().get_next_shape,
+                            board = Board(replay.columns, replay.rows),
+                            clock = SimulationClock(1000 / replay.tick_rate))
+    for step in range(steps):
+        if simulation.engine.game_over:
+            break
+
+        keys = tuple(rng.random() < p for p in (0.2, 0.2, 0.15, 0.1))
+        recorder.record(keys)
+        simulation.step(*keys)
+
+    return simulation, replay
+
+def test_bytes_round_trip():
+    simulation, replay = record_game(3, 2000)
+    decoded = Replay.from_bytes(replay.to_bytes())
+
+    assert (decoded.kind, decoded.seed, decoded.tick_rate, decoded.columns, decoded.rows) == \
+        (replay.kind, replay.seed, replay.tick_rate, replay.columns, replay.rows)
+    assert decoded.events == replay.events
+    assert decoded.steps == replay.steps
+    assert list(decoded.iter_keys()) == list(replay.iter_keys())
+
+@pytest.mark.parametrize('seed', range(5))
+def test_playback_reproduces_game(seed):
+    simulation, replay = record_game(seed, 3000)
+    played = simulate(Replay.from_bytes(replay.to_bytes())).engine
+    engine = simulation.engine
+
+    assert played.field_data == engine.field_data
+    assert (played.current_score, played.current_lines, played.current_level) == \
+        (engine.current_score, engine.current_lines, engine.current_level)
+    assert (played.pieces_placed, played.game_over) == (engine.pieces_placed, engine.game_over)
+    assert (played.piece.shape, played.piece.rotation, played.piece.x, played.piece.y) == \
+        (engine.piece.shape, engine.piece.rotation, engine.piece.x, engine.piece.y)
+
+def test_corrupt_data_raises_value_error():
+    data = Replay('bag', 5, [(3, 1), (200, 0)], 300).to_bytes()
+    header_size = len(data) - 5
+
+    # short header, unknown randomizer, and records cut off before the end
+    for bad in (data[:10], data[:5] + bytes([99]) + data[6:], data[:-1], data[:header_size + 1]):
+        with pytest.raises(ValueError):
+            Replay.from_bytes(bad)
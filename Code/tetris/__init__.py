@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+"""
+Tetris package.
+
+The headless game engine, the tools built on it, and the pygame front end in
+tetris.app. Importing this package, or any module in it other than app and
+assets, does not import pygame; main.py starts the game.
+"""
@@ -0,0 +1,550 @@
+# -*- coding: utf-8 -*-
+
+"""
+Placement search bot.
+
+find_placements() walks every state the falling piece can reach from where it
+is with the engine's own moves (left, right, rotate and down), so tucks under
+overhangs that need a soft drop are found along with the plain drops. States
+are tested with the precomputed footprints against a list of row bitmasks, so
+a copy of the board is a copy of a short list of ints. Every state the piece
+rests in is a placement, and each is scored by a weighted sum of aggregate
+height, holes, bumpiness and lines cleared, looking ahead through the preview
+if asked to. Searches can be kept in a transposition table keyed on the board
+and the shapes still to place: the boards every placement of a shape leaves,
+which the next piece's search expands again, and the best score reachable with
+the rest of the preview. The scores of the last boards of the lookahead almost
+never repeat, so they are not kept. It is off by default; with a lookahead of
+two it saves about a tenth of the search time, with one it saves nothing.
+"""
+
+from collections import deque
+
+from .engine import NOOP, LEFT, RIGHT, ROTATE, DOWN, DROP
+from .rotations import FOOTPRINTS
+from .transposition import MISSING, TranspositionTable, board_key
+
+DEFAULT_WEIGHTS = {
+    'height': -0.510066,
+    'lines': 0.760666,
+    'holes': -0.35663,
+    'bumpiness': -0.184483
+}
+
+def board_masks(board):
+    """
+    Returns a copy of the rows of a board as bitmasks
+
+    Parameters
+    ----------
+    board : Board or BitBoard object
+        the playing field
+
+    Returns
+    -------
+    list
+        bitmask of the occupied cells of every row
+    """
+    masks = getattr(board, 'row_masks', None)
+    if masks is not None:
+        return list(masks)
+
+    return [sum(1 << x for x, shape in enumerate(row) if shape) for row in board.field_data]
+
+def find_placements(masks, columns, shape, start):
+    """
+    Finds every state a piece can reach and rest in
+
+    Parameters
+    ----------
+    masks : list
+        bitmask of every row of the board
+    columns : int
+        width of the board
+    shape : str
+        letter of the piece
+    start : tuple
+        rotation, x, and y of the piece
+
+    Returns
+    -------
+    placements : list
+        (rotation, x, y) of every resting state, one per distinct set of cells
+    parents : dict
+        (previous state, actions from it) for every state reached, None for
+        the start
+    """
+    rows = len(masks)
+    footprints = FOOTPRINTS[shape]
+
+    def free(rotation, x, y):
+        left, right, top, piece_masks = footprints[rotation]
+        shift = x + left
+        if shift < 0 or x + right >= columns:
+            return False
+
+        y += top
+        if y + len(piece_masks) > rows:
+            return False
+
+        for mask in piece_masks:
+            if y >= 0 and masks[y] & mask << shift:
+                return False
+            y += 1
+
+        return True
+
+    if not free(*start):
+        return [], {start: None}
+
+    # rows above the highest block are empty, so the piece can turn and slide
+    # there the same at any height, then fall straight down
+    surface = next((y for y, mask in enumerate(masks) if mask), rows)
+    parents = {start: None}
+    queue = deque([start])
+    above = []
+    while queue:
+        state = queue.popleft()
+        above.append(state)
+        rotation, x, y = state
+
+        moves = [(LEFT, (rotation, x - 1, y)), (RIGHT, (rotation, x + 1, y))]
+        if shape != 'O':
+            moves.append((ROTATE, ((rotation + 1) % 4, x, y)))
+
+        for action, next_state in moves:
+            if next_state not in parents and free(*next_state):
+                parents[next_state] = (state, [action])
+                queue.append(next_state)
+
+    # straight drops first, so a piece turns and slides before it falls
+    # wherever it can
+    for state in above:
+        rotation, x, y = state
+        left, right, top, piece_masks = footprints[rotation]
+        low = max(y, surface - top - len(piece_masks))
+        landed = (rotation, x, low)
+        if landed not in parents:
+            parents[landed] = (state, [DOWN] * (low - y))
+        queue.append(landed)
+
+        while free(rotation, x, low + 1):
+            landed = (rotation, x, low + 1)
+            if landed not in parents:
+                parents[landed] = ((rotation, x, low), [DOWN])
+            queue.append(landed)
+            low += 1
+
+    # drops that met on the way down are expanded once
+    queue = deque(dict.fromkeys(queue))
+
+    # from the highest block down, every state reachable, tucks included
+    placements = []
+    seen_cells = set()
+    while queue:
+        state = queue.popleft()
+        rotation, x, y = state
+
+        moves = [(LEFT, (rotation, x - 1, y)), (RIGHT, (rotation, x + 1, y)),
+                 (DOWN, (rotation, x, y + 1))]
+        if shape != 'O':
+            moves.append((ROTATE, ((rotation + 1) % 4, x, y)))
+
+        for action, next_state in moves:
+            if next_state not in parents and free(*next_state):
+                parents[next_state] = (state, [action])
+                queue.append(next_state)
+
+        # resting, keep the first state for every set of cells
+        if not free(rotation, x, y + 1):
+            left, right, top, piece_masks = footprints[rotation]
+            cells = (y + top, x + left, piece_masks)
+            if cells not in seen_cells:
+                seen_cells.add(cells)
+                placements.append(state)
+
+    return placements, parents
+
+def get_path(parents, state):
+    """
+    Returns the actions that move a piece from its start to a state
+
+    Parameters
+    ----------
+    parents : dict
+        as returned by find_placements
+    state : tuple
+        rotation, x, and y to reach
+
+    Returns
+    -------
+    list
+    """
+    path = []
+    while parents[state] is not None:
+        state, actions = parents[state]
+        path[:0] = actions
+
+    return path
+
+def lock(masks, columns, shape, state):
+    """
+    Places a piece on a copy of the board and clears full rows
+
+    Parameters
+    ----------
+    masks : list
+        bitmask of every row of the board
+    columns : int
+        width of the board
+    shape : str
+        letter of the piece
+    state : tuple
+        rotation, x, and y of the piece
+
+    Returns
+    -------
+    masks : list
+        rows of the new board, None if the piece locked above the field
+    lines : int
+        number of rows cleared
+    """
+    rotation, x, y = state
+    left, right, top, piece_masks = FOOTPRINTS[shape][rotation]
+    y += top
+    if y < 0:
+        return None, 0
+
+    masks = list(masks)
+    shift = x + left
+    for mask in piece_masks:
+        masks[y] |= mask << shift
+        y += 1
+
+    full_mask = (1 << columns) - 1
+    kept = [mask for mask in masks if mask != full_mask]
+    lines = len(masks) - len(kept)
+    if lines:
+        masks = [0] * lines + kept
+
+    return masks, lines
+
+def get_features(masks, columns):
+    """
+    Measures the aggregate height, holes, and bumpiness of a board
+
+    Parameters
+    ----------
+    masks : list
+        bitmask of every row of the board
+    columns : int
+        width of the board
+
+    Returns
+    -------
+    height : int
+        sum of the heights of all columns
+    holes : int
+        empty cells with a filled cell somewhere above them
+    bumpiness : int
+        sum of the height differences of neighbouring columns
+    """
+    rows = len(masks)
+    heights = [0] * columns
+    full_mask = (1 << columns) - 1
+    covered = 0
+    holes = 0
+    for y, mask in enumerate(masks):
+        holes += bin(covered & ~mask & full_mask).count('1')
+
+        # columns whose top block is in this row
+        new = mask & ~covered
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = rows - y
+            new ^= low
+        covered |= mask
+
+    bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+    return sum(heights), holes, bumpiness
+
+def evaluate(masks, columns, lines, weights = DEFAULT_WEIGHTS):
+    """
+    Scores a board with the weighted heuristic
+
+    Parameters
+    ----------
+    masks : list
+        bitmask of every row of the board
+    columns : int
+        width of the board
+    lines : int
+        rows cleared on the way to the board
+    weights : dict
+        weight of height, lines, holes, and bumpiness
+
+    Returns
+    -------
+    float
+        higher is better
+    """
+    height, holes, bumpiness = get_features(masks, columns)
+    return (weights['height'] * height + weights['lines'] * lines +
+            weights['holes'] * holes + weights['bumpiness'] * bumpiness)
+
+class Bot:
+    """
+    A class to play the best placement found by the search.
+
+    ...
+
+    Attributes
+    ----------
+    weights : dict
+        weight of height, lines, holes, and bumpiness
+    weights_key : tuple
+        weights in a form that can be part of a table key
+    lookahead : int
+        number of preview shapes searched after the falling piece
+    evaluated : int
+        boards scored so far, not counting ones found in the table
+    table : TranspositionTable object
+        searches by board and shapes to place, None to search everything
+        every time
+    plan : list
+        actions left for the falling piece
+    planned_piece : Piece object
+        piece the plan was made for
+
+    Methods
+    -------
+    def score_board(masks, columns):
+        returns the heuristic score of a board
+
+    def children(masks, columns, shape, start):
+        returns the boards left by every placement of a shape
+
+    def value(masks, columns, shapes, start):
+        returns the best score reachable with the given shapes
+
+    def choose(engine, next_shapes):
+        returns the best placement and the path to it
+
+    def actions(engine, next_shapes):
+        returns the actions that play the falling piece
+
+    def next_action(engine, next_shapes):
+        returns one action at a time
+    """
+    def __init__(self, seed = None, weights = None, lookahead = 1, table_size = 0):
+        """
+        Constructs all necessary attributes for the Bot class
+
+        Parameters
+        ----------
+        seed : int
+            not used, the bot always plays the same way, taken so the bot
+            can be made like the other policies
+        weights : dict
+            weight of height, lines, holes, and bumpiness, DEFAULT_WEIGHTS
+            if None
+        lookahead : int
+            number of preview shapes searched after the falling piece
+        table_size : int
+            most entries in the transposition table, 0 for no table
+        """
+        self.weights = weights or DEFAULT_WEIGHTS
+        self.weights_key = tuple(sorted(self.weights.items()))
+        self.lookahead = lookahead
+        self.evaluated = 0
+        self.table = TranspositionTable(table_size) if table_size else None
+        self.plan = []
+        self.planned_piece = None
+
+    def score_board(self, masks, columns):
+        """
+        Returns the heuristic score of a board, not counting lines
+
+        Parameters
+        ----------
+        masks : list
+            bitmask of every row of the board
+        columns : int
+            width of the board
+
+        Returns
+        -------
+        float
+        """
+        self.evaluated += 1
+        score = evaluate(masks, columns, 0, self.weights)
+        return score
+
+    def children(self, masks, columns, shape, start):
+        """
+        Returns the boards left by every placement of a shape from its spawn
+
+        Parameters
+        ----------
+        masks : list
+            bitmask of every row of the board
+        columns : int
+            width of the board
+        shape : str
+            letter of the shape to place
+        start : tuple
+            spawn rotation, x, and y, fixed by the width of the board
+
+        Returns
+        -------
+        list
+            (masks, lines) of the board after every placement that does not
+            lock above the field
+        """
+        if self.table is not None:
+            key = board_key(masks, columns, self.weights_key, shape)
+            boards = self.table.get(key)
+            if boards is not MISSING:
+                return boards
+
+        boards = []
+        placements, parents = find_placements(masks, columns, shape, start)
+        for state in placements:
+            new_masks, lines = lock(masks, columns, shape, state)
+            if new_masks is not None:
+                boards.append((tuple(new_masks), lines))
+
+        if self.table is not None:
+            self.table.put(key, boards)
+        return boards
+
+    def value(self, masks, columns, shapes, start):
+        """
+        Returns the best score reachable by placing the given shapes in turn
+
+        Parameters
+        ----------
+        masks : list
+            bitmask of every row of the board
+        columns : int
+            width of the board
+        shapes : tuple
+            letters of the shapes to place, at least one
+        start : tuple
+            spawn rotation, x, and y
+
+        Returns
+        -------
+        float
+        """
+        if self.table is not None:
+            key = board_key(masks, columns, self.weights_key, shapes)
+            best = self.table.get(key)
+            if best is not MISSING:
+                return best
+
+        best = float('-inf')
+        for new_masks, lines in self.children(masks, columns, shapes[0], start):
+            if len(shapes) > 1:
+                score = self.value(new_masks, columns, shapes[1:], start)
+            else:
+                score = self.score_board(new_masks, columns)
+            best = max(best, score + self.weights['lines'] * lines)
+
+        if self.table is not None:
+            self.table.put(key, best)
+        return best
+
+    def choose(self, engine, next_shapes):
+        """
+        Returns the best placement of the falling piece
+
+        Parameters
+        ----------
+        engine : Engine object
+            game to play
+        next_shapes : deque
+            upcoming shapes
+
+        Returns
+        -------
+        state : tuple
+            rotation, x, and y to rest the piece in, None if it has nowhere
+            to go
+        path : list
+            actions that move the piece there
+        """
+        piece = engine.piece
+        columns = engine.board.columns
+        masks = board_masks(engine.board)
+        start = (piece.rotation, piece.x, piece.y)
+        spawn = (0,) + tuple(engine.spawn_offset)
+        preview = tuple(next_shapes)[:self.lookahead]
+
+        best_state, best_score = None, float('-inf')
+        placements, parents = find_placements(masks, columns, piece.shape, start)
+        for state in placements:
+            new_masks, lines = lock(masks, columns, piece.shape, state)
+            if new_masks is None:
+                continue
+
+            if preview:
+                score = self.value(new_masks, columns, preview, spawn)
+            else:
+                score = self.score_board(new_masks, columns)
+            score += self.weights['lines'] * lines
+
+            if best_state is None or score > best_score:
+                best_state, best_score = state, score
+
+        # every placement ends the game, take any
+        if best_state is None and placements:
+            best_state = placements[0]
+
+        path = get_path(parents, best_state) if best_state is not None else []
+        return best_state, path
+
+    def actions(self, engine, next_shapes):
+        """
+        Returns the actions that play the falling piece
+
+        Parameters
+        ----------
+        engine : Engine object
+            game to play
+        next_shapes : deque
+            upcoming shapes
+
+        Returns
+        -------
+        list
+            engine actions, ending with DROP
+        """
+        state, path = self.choose(engine, next_shapes)
+        return path + [DROP]
+
+    def next_action(self, engine, next_shapes):
+        """
+        Returns the next action, planning again for every new piece
+
+        Parameters
+        ----------
+        engine : Engine object
+            game to play
+        next_shapes : deque
+            upcoming shapes
+
+        Returns
+        -------
+        int
+            NOOP once the game is over
+        """
+        if engine.game_over:
+            return NOOP
+
+        if engine.piece is not self.planned_piece:
+            self.plan = self.actions(engine, next_shapes)
+            self.plan.reverse()
+            self.planned_piece = engine.piece
+
+        return self.plan.pop() if self.plan else NOOP
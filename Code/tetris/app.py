@@ -0,0 +1,2049 @@
+# -*- coding: utf-8 -*-
+
+"""
+Pygame front end.
+
+The window, falling piece, menu, preview and score panel that draw the headless
+engine. This is the only module of the package that imports pygame, and
+nothing else in the package imports it except to render, so simulations and
+workers never pay for pygame. Start the game with main.py.
+"""
+
+from sys import exit
+from math import ceil
+import pygame
+
+from collections import OrderedDict
+from random import randrange
+import os
+import time
+
+from .settings import (Config, columns, rows, cell_size, game_width, game_height,
+                       sidebar_width, preview_height_frac, score_height_frac,
+                       padding, window_width, window_height, preview_depth,
+                       dirty_rendering, text_cache_size, sound_effects,
+                       sound_volume, sound_channels, tetromino_dict, GRAY,
+                       DARK_PURPLE, LINE_COLOR)
+from .assets import get_assets
+from .profiler import FrameProfiler
+from .randomizer import ShapeQueue, make_randomizer
+from .replay import ReplayRecorder
+from .simulation import Simulation
+from .timing import FixedStep, SimulationClock
+
+# files loaded when the game starts
+MENU_IMAGES = ['images/button_{}.png'.format(name) for name in
+               ('resume', 'options', 'quit', 'video', 'audio', 'keys', 'back')]
+SHAPE_IMAGES = ['graphics/{}.png'.format(shape) for shape in tetromino_dict]
+FONT = 'graphics/Russo_One.ttf'
+MUSIC = 'music/barge.wav'
+
+class Main:
+    """
+    A class to run the entire game.
+
+    ...
+
+    Attributes
+    ----------
+    display_surface : pygame display object
+        surface on which game is displayed
+    clock : pygame clock object
+        clock used for internal timer
+    paused : bool
+        variable to check if game is paused
+    menu_state : str
+        varible to check menu state
+    clicked : bool
+        checks if mouse is currently pressed down
+    shape_queue : ShapeQueue object
+        deals shapes from the chosen randomizer
+    next_shapes : deque
+        list of upcoming shapes
+    game : Game class object
+        initializes the Game class
+    score : Score class object
+        initializes the Score class
+    preview : Preview class object
+        initializes the Preview class
+    menu : Menu class object
+        initializes the Menu class
+    music_on : bool
+        stores state of music on or off
+    sounds : SoundEffects object
+        plays the sound effects of locks and line clears
+    drawn_state : tuple
+        paused and menu state of the last full redraw
+    config : Config object
+        run options of the game
+    assets : AssetManager object
+        loads and keeps the images and fonts
+    profiler : FrameProfiler object
+        times the sections of every frame, None when not profiling
+    overlay : ProfileOverlay object
+        shows the frame times on screen, None when hidden
+
+    Methods
+    -------
+    def update_score(lines, score, level):
+        updates user score
+        
+    def get_next_shape():
+        obtains the next shape
+
+    def get_timeout():
+        returns how long the loop may sleep
+
+    def wait():
+        sleeps until the next frame is due
+
+    def quit():
+        saves the replay and closes the game
+
+    def run():
+        runs the game
+    """
+    def __init__(self, replay = None, playback_rate = 1, bot = None, config = None):
+        """
+        Constructs all necessary objects to run the game
+
+        Parameters
+        ----------
+        replay : Replay object
+            recorded game to watch instead of playing, None to play
+        playback_rate : float
+            speed the replay is watched at
+        bot : Bot object
+            bot that plays the game, None to play with the keyboard
+        config : Config object
+            randomizer, seed, preview depth, frame rate, replay, asset,
+            sound, and profiling options, the ones in settings.py if None
+        display_surface : pygame display object
+            surface on which game is displayed
+        clock : pygame clock object
+            clock used for internal timer
+        paused : bool
+            variable to check if game is paused
+        menu_state : str
+            varible to check menu state
+        clicked : bool
+            checks if mouse is currently pressed down
+        shape_queue : ShapeQueue object
+            deals shapes from the chosen randomizer
+        next_shapes : deque
+            list of upcoming shapes
+        game : Game class object
+            initializes the Game class
+        score : Score class object
+            initializes the Score class
+        preview : Preview class object
+            initializes the Preview class
+        menu : Menu class object
+            initializes the Menu class
+        music_on : bool
+            stores state of music on or off
+        sounds : SoundEffects object
+            plays the sound effects of locks and line clears
+        drawn_state : tuple
+            paused and menu state of the last full redraw
+        config : Config object
+            run options of the game
+        assets : AssetManager object
+            loads and keeps the images and fonts
+        profiler : FrameProfiler object
+            times the sections of every frame, None when not profiling
+        overlay : ProfileOverlay object
+            shows the frame times on screen, None when hidden
+        """
+        # general
+        self.config = config = config or Config()
+        
+        # images, decoded in the background while the window opens
+        self.assets = get_assets(config.asset_cache, config.asset_workers)
+        self.assets.preload(MENU_IMAGES + SHAPE_IMAGES)
+        
+        pygame.init()
+        self.display_surface = pygame.display.set_mode((window_width, window_height))
+        self.clock = pygame.time.Clock()
+        self.paused = True
+        self.menu_state = "main"
+        self.clicked = False
+        pygame.display.set_caption("Tetris")
+        
+        # shapes, with a known seed so the game can be replayed
+        if replay:
+            kind, game_seed = replay.kind, replay.seed
+            recorder = None
+            
+        else:
+            kind = config.randomizer
+            game_seed = config.seed if config.seed is not None else randrange(2 ** 32)
+            # replays hold keys, a bot's actions are not recorded
+            recorder = ReplayRecorder(kind, game_seed) if not bot else None
+            
+        self.shape_queue = ShapeQueue(make_randomizer(kind, game_seed), config.preview_depth)
+        self.next_shapes = self.shape_queue.next_shapes
+        
+        # sound, the music is streamed from its file instead of decoded whole
+        pygame.mixer.music.load(self.assets.path(MUSIC))
+        pygame.mixer.music.set_volume(config.music_volume)
+        pygame.mixer.music.play()
+        self.music_on = True
+        self.sounds = SoundEffects(self.assets, config.sound_effects,
+                                   config.sound_channels, config.sound_volume)
+        
+        # components
+        self.game = Game(self.get_next_shape, self.update_score, recorder,
+                         replay, playback_rate, bot, self.next_shapes, config,
+                         self.sounds)
+        self.score = Score(self.assets, config.dirty_rendering, config.text_cache_size)
+        self.preview = Preview(config.preview_depth, self.assets, config.dirty_rendering)
+        self.menu = Menu(self.assets)
+        
+        # rendering
+        self.drawn_state = None
+        
+        # profiling
+        self.profiler = None
+        self.overlay = None
+        if config.profile_frames or config.profile_csv:
+            self.profiler = FrameProfiler(config.fps, config.profile_window,
+                                          config.profile_csv)
+            self.game.instrument(self.profiler)
+            self.score.run = self.profiler.wrap('draw', self.score.run)
+            self.preview.run = self.profiler.wrap('draw', self.preview.run)
+            
+        if config.profile_frames:
+            self.overlay = ProfileOverlay(self.profiler, assets = self.assets)
+        
+    def update_score(self, lines, score, level):
+        """
+        Updates the user score
+
+        Parameters
+        ----------
+        lines : int
+            Number of lines cleared
+        score : int
+            User score
+        level : int
+            Current level of game
+        
+        Returns
+        -------
+        None
+        """
+        self.score.lines = lines
+        self.score.score = score
+        self.score.level = level
+        self.sounds.play('clear')
+        
+    def get_next_shape(self):
+        """
+        Obtains the next shape
+
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        next_shape : str
+            The next shape to be placed
+        """
+        return self.shape_queue.get_next_shape()
+        
+    def get_timeout(self):
+        """
+        Returns how long the loop may sleep before something changes
+
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        timeout : int or None
+            time in ms until the next timer is due, None to wait for input
+        """
+        # the menu only changes on input
+        if self.paused:
+            return None
+        
+        # held keys repeat on every frame once their timer runs out
+        if self.game.keys_held():
+            return 0
+        
+        return self.game.get_timeout()
+        
+    def wait(self):
+        """
+        Sleeps until the next frame is due, an input event arrives, or the
+        next timer runs out, whichever comes first
+
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.clock.tick(self.config.fps)
+        if not self.config.event_driven:
+            return
+        
+        timeout = self.get_timeout()
+        if timeout is None:
+            event = pygame.event.wait()
+            
+        elif timeout > 0:
+            event = pygame.event.wait(timeout)
+            
+        else:
+            return
+        
+        # leave the event for the loop to handle
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
+        
+    def quit(self):
+        """
+        Saves the replay of the game and closes the window
+
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.game.save_replay()
+        self.assets.close()
+        if self.profiler:
+            self.profiler.close()
+        pygame.quit()
+        exit()
+        
+    def run(self):
+        """
+        Runs the game
+
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        profiler = self.profiler
+        while True:                
+            if profiler:
+                profiler.begin_frame()
+                profiler.start('input')
+                
+            for event in pygame.event.get():
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_SPACE or event.key == pygame.K_ESCAPE:
+                        self.paused = True
+                        
+                if event.type == pygame.QUIT:
+                    self.quit()
+                    
+                if event.type == pygame.MOUSEBUTTONUP:
+                    self.clicked = False
+            
+            if profiler:
+                profiler.stop()
+            
+            # display, redrawn in full only when the screen changes
+            state = (self.paused, self.menu_state)
+            redraw = not self.config.dirty_rendering or state != self.drawn_state
+            resumed = not self.paused and (self.drawn_state is None or self.drawn_state[0])
+            self.drawn_state = state
+            
+            if redraw:
+                self.display_surface.fill(DARK_PURPLE)
+            
+            # check if game paused
+            if self.paused == True:
+                # unchanged buttons are only checked for clicks
+                surface = self.display_surface if redraw else None
+                
+                #check menu state
+                if self.menu_state == "main":
+                    if self.menu.resume_button.draw(surface):
+                        self.paused = False
+                    
+                    if self.menu.options_button.draw(surface) and not self.clicked:
+                        self.menu_state = "options"
+                        self.clicked = True
+                    
+                    if self.menu.quit_button.draw(surface):
+                        self.quit()
+                
+                if self.menu_state == "options":
+                    if self.menu.video_button.draw(surface):
+                        pass
+                    
+                    if self.menu.audio_button.draw(surface) and not self.clicked:
+                        # paused music carries on where it stopped
+                        if self.music_on:
+                            pygame.mixer.music.pause()
+                            self.music_on = False
+                            
+                        else:
+                            pygame.mixer.music.unpause()
+                            self.music_on = True
+                        
+                    if self.menu.keys_button.draw(surface):
+                        pass
+                    
+                    if self.menu.back_button.draw(surface):
+                        self.menu_state = "main"
+                
+                rects = []
+                
+            else:
+                if resumed:
+                    self.game.resume()
+                    
+                if redraw:
+                    self.game.force_redraw()
+                    self.score.force_redraw()
+                    self.preview.force_redraw()
+                
+                # components
+                rects = self.game.run()
+                rects += self.score.run()
+                rects += self.preview.run(self.next_shapes)
+                if self.overlay:
+                    rects += self.overlay.run()
+                
+            # updating the game
+            if profiler:
+                profiler.start('display_update')
+                
+            if redraw:
+                pygame.display.update()
+                
+            elif rects:
+                pygame.display.update(rects)
+                
+            if profiler:
+                profiler.stop()
+                profiler.end_frame()
+                
+            self.wait()
+
+class Game:
+    """
+    A class to represent the Game.
+
+    ...
+
+    Attributes
+    ----------
+    surface : pygame surface object
+        surface on which main game is displayed
+    display_surface : pygame surface object
+        current surface of display
+    rect : bool
+        variable to check if game is paused
+    tiles : TileAtlas object
+        one shared block image per shape
+    get_next_shape : str
+        next shape to be placed
+    update_main_score : int, int, int
+        represents lines, level, and score
+    line_surface : pygame surface object
+        grid lines, drawn once and reused every frame
+    grid_key : tuple
+        size of the surface the grid lines were drawn for
+    simulation : Simulation object
+        engine and timers, run in fixed steps
+    engine : Engine object
+        headless engine that runs the rules of the game
+    field_data : list
+        numerical representation of game grid
+    tetromino : Tetromino class object
+        a random shape
+    timers : dict
+        different timers to represent actions completed
+    stepper : FixedStep object
+        turns real time into simulation steps
+    last_ticks : int
+        real time of the last update
+    recorder : ReplayRecorder object
+        records the keys of every step, None while watching a replay
+    replay_keys : generator
+        keys of a replay being watched, None while playing
+    replay_over : bool
+        the replay being watched has no steps left, its last frame stays
+    playback_rate : float
+        speed the game runs at compared to real time
+    bot : Bot object
+        bot that plays the game, None while the user plays
+    next_shapes : deque
+        upcoming shapes, seen by the bot
+    config : Config object
+        run options of the game
+    sounds : SoundEffects object
+        plays a sound when a piece locks, None for no sound
+    settled : pygame surface object
+        background and locked blocks, painted when a piece locks
+    settled_pieces : int
+        pieces locked when settled was last painted, None to repaint it
+    changed_rows : int
+        top rows of settled changed since the last frame
+    changed_cells : set
+        cells of settled changed since the last frame
+    drawn_piece : tuple
+        shape and cells of the piece on screen, None before a full redraw
+    
+    Methods
+    -------
+    def save_replay():
+        writes the recorded game to the replay folder
+        
+    def check_game_over():
+        checks if the user has lost
+    
+    def create_new_tetromino:
+        creates new tetromino object
+        
+    def attach(engine):
+        draws another engine from now on
+        
+    def instrument(profiler):
+        times input, timers, the falling piece, and drawing
+        
+    def update_tetromino():
+        moves blocks to the engine's piece
+        
+    def resume():
+        restarts the simulation time after a pause
+        
+    def draw_field():
+        draws locked blocks onto settled
+        
+    def settle():
+        paints the piece that just locked onto settled
+        
+    def build_grid():
+        draws the grid lines onto line_surface
+        
+    def draw_grid():
+        draws grid of game onto surface
+        
+    def get_piece():
+        returns the shape and cells of the falling piece
+        
+    def draw_changed_cells():
+        draws only the cells that changed since the last frame
+        
+    def force_redraw():
+        draws everything on the next frame
+        
+    def input():
+        returns the keys held by the user or the replay
+        
+    def keys_held():
+        checks if a key that repeats is held down
+        
+    def get_timeout():
+        returns the time until the next timer runs out
+        
+    def draw():
+        draws the engine's state
+        
+    def run():
+        runs the Game class
+    """
+    def __init__(self, get_next_shape, update_score, recorder = None,
+                 replay = None, playback_rate = 1, bot = None, next_shapes = (),
+                 config = None, sounds = None):
+        """
+        Constructs all necessary attributes for the Game object
+
+        Parameters
+        ----------
+        surface : pygame surface object
+            surface on which main game is displayed
+        display_surface : pygame surface object
+            current surface of display
+        rect : bool
+            variable to check if game is paused
+        tiles : TileAtlas object
+            one shared block image per shape
+        get_next_shape : str
+            next shape to be placed
+        update_main_score : int, int, int
+            represents lines, level, and score
+        line_surface : pygame surface object
+            grid lines, drawn once and reused every frame
+        grid_key : tuple
+            size of the surface the grid lines were drawn for
+        simulation : Simulation object
+            engine and timers, run in fixed steps
+        engine : Engine object
+            headless engine that runs the rules of the game
+        field_data : list
+            numerical representation of game grid
+        tetromino : Tetromino class object
+            a random shape
+        timers : dict
+            different timers to represent actions completed
+        stepper : FixedStep object
+            turns real time into simulation steps
+        last_ticks : int
+            real time of the last update
+        recorder : ReplayRecorder object
+            records the keys of every step, None while watching a replay
+        replay_keys : generator
+            keys of a replay being watched, None while playing
+        playback_rate : float
+            speed the game runs at compared to real time
+        bot : Bot object
+            bot that plays the game, None while the user plays
+        next_shapes : deque
+            upcoming shapes, seen by the bot
+        config : Config object
+            run options of the game, the ones in settings.py if None
+        sounds : SoundEffects object
+            plays a sound when a piece locks, None for no sound
+        settled : pygame surface object
+            background and locked blocks, painted when a piece locks
+        settled_pieces : int
+            pieces locked when settled was last painted, None to repaint it
+        changed_rows : int
+            top rows of settled changed since the last frame
+        changed_cells : set
+            cells of settled changed since the last frame
+        drawn_piece : tuple
+            shape and cells of the piece on screen, None before a full redraw
+        """
+        # general
+        self.surface = pygame.Surface ((game_width, game_height))
+        self.display_surface = pygame.display.get_surface()
+        self.rect = self.surface.get_rect(topleft = (padding, padding))
+        self.tiles = TileAtlas(cell_size)
+        
+        # game connection
+        self.get_next_shape = get_next_shape
+        self.update_main_score = update_score
+        
+        # options
+        self.config = config = config or Config()
+        self.sounds = sounds
+        
+        # lines
+        self.build_grid()
+        
+        # a replay is stepped at the rate it was recorded at, and only fits
+        # the field it was recorded on
+        if replay and (replay.columns, replay.rows) != (columns, rows):
+            raise ValueError("replay was recorded on a {}x{} field, this one is {}x{}".format(
+                replay.columns, replay.rows, columns, rows))
+        step_rate = replay.tick_rate if replay else config.tick_rate
+        
+        # tetromino
+        self.simulation = Simulation(get_next_shape, update_score,
+                                     clock = SimulationClock(1000 / step_rate))
+        self.engine = self.simulation.engine
+        self.field_data = self.engine.field_data
+        self.tetromino = Tetromino(self.engine, self.tiles)
+        
+        # timer
+        self.timers = self.simulation.timers
+        self.stepper = FixedStep(self.simulation.clock, ceil(step_rate * playback_rate))
+        self.last_ticks = pygame.time.get_ticks()
+        
+        # replay
+        self.recorder = recorder
+        self.replay_keys = replay.iter_keys() if replay else None
+        self.replay_over = False
+        self.playback_rate = playback_rate
+        
+        # bot
+        self.bot = bot
+        self.next_shapes = next_shapes
+        
+        # rendering
+        self.settled = pygame.Surface((game_width, game_height))
+        self.settled_pieces = None
+        self.changed_rows = 0
+        self.changed_cells = set()
+        self.drawn_piece = None
+        
+    def save_replay(self):
+        """
+        Writes the recorded game to the replay folder
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        None
+        """
+        if not self.config.save_replays or not self.recorder or not self.recorder.replay.steps:
+            return
+        
+        replay = self.recorder.replay
+        folder = self.config.replay_folder
+        os.makedirs(folder, exist_ok = True)
+        name = "{}-{}.ttr".format(time.strftime("%Y%m%d-%H%M%S"), replay.seed)
+        replay.save(os.path.join(folder, name))
+        
+    def check_game_over(self):
+        """
+        Checks if user loses and quits if lost
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        None
+        """
+        if self.engine.game_over:
+            self.save_replay()
+            pygame.quit()
+            exit()
+    
+    def create_new_tetromino(self):
+        """
+        Creates new Tetromino object for the engine's next piece
+
+        Parameters
+        ----------
+        None
+        
+        -------
+        None
+        """
+        self.check_game_over()
+        self.settle()
+        if self.sounds:
+            self.sounds.play('lock')
+            
+        self.tetromino = Tetromino(self.engine, self.tiles)
+    
+    def attach(self, engine):
+        """
+        Draws another engine from now on, such as one stepped by an
+        environment instead of the timers
+
+        Parameters
+        ----------
+        engine : Engine object
+            engine to draw
+
+        Returns
+        -------
+        None
+        """
+        self.engine = engine
+        self.field_data = engine.field_data
+        self.tetromino = Tetromino(self.engine, self.tiles)
+        self.force_redraw()
+
+    def instrument(self, profiler):
+        """
+        Times the key polling, timer updates, moving the falling piece's
+        blocks, and drawing of every frame from now on
+
+        Parameters
+        ----------
+        profiler : FrameProfiler object
+            profiler to report the times to
+
+        Returns
+        -------
+        None
+        """
+        self.input = profiler.wrap('input', self.input)
+        self.simulation.timer_update = profiler.wrap('timer_update',
+                                                     self.simulation.timer_update)
+        self.update_tetromino = profiler.wrap('piece_update', self.update_tetromino)
+        self.draw = profiler.wrap('draw', self.draw)
+
+    def update_tetromino(self):
+        """
+        Moves the blocks to the engine's piece, or replaces them once the
+        piece has locked
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        None
+        """
+        if self.tetromino.piece is not self.engine.piece or self.engine.game_over:
+            self.create_new_tetromino()
+            
+        else:
+            self.tetromino.sync()
+    
+    def resume(self):
+        """
+        Restarts the simulation time so a pause is not caught up on
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        None
+        """
+        self.last_ticks = pygame.time.get_ticks()
+        self.stepper.accumulator = 0.0
+    
+    def draw_field(self):
+        """
+        Paints the locked blocks stored in the engine's grid onto settled in
+        one batch
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        None
+        """
+        tiles = self.tiles.tiles
+        self.settled.fill(DARK_PURPLE)
+        self.settled.blits([(tiles[shape], (x * cell_size, y * cell_size))
+                            for y, row in enumerate(self.field_data)
+                            for x, shape in enumerate(row) if shape], False)
+        
+        self.settled_pieces = self.engine.pieces_placed
+        self.changed_rows = 0
+        self.changed_cells.clear()
+        self.drawn_piece = None
+    
+    def settle(self):
+        """
+        Paints the piece that just locked onto settled, and moves the rows
+        above every cleared row down one cell the way the board did
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        None
+        """
+        engine = self.engine
+        if self.settled_pieces is None or engine.pieces_placed != self.settled_pieces + 1:
+            # more than one piece locked since the last frame, or a new game
+            self.settled_pieces = None
+            return
+        
+        piece = self.tetromino.piece
+        cells = [(x, y) for x, y in piece.cells if y >= 0]
+        tile = self.tiles.tiles[piece.shape]
+        self.settled.blits([(tile, (x * cell_size, y * cell_size)) for x, y in cells], False)
+        self.changed_cells.update(cells)
+        
+        # top down, like the board, so each scroll leaves the rows below as
+        # they were
+        for y in engine.cleared_rows:
+            self.settled.set_clip((0, 0, game_width, (y + 1) * cell_size))
+            self.settled.scroll(0, cell_size)
+            self.settled.set_clip(None)
+            self.settled.fill(DARK_PURPLE, (0, 0, game_width, cell_size))
+            self.changed_rows = max(self.changed_rows, y + 1)
+            
+        self.settled_pieces += 1
+    
+    def build_grid(self):
+        """
+        Draws the grid lines once onto line_surface
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        None
+        """
+        self.line_surface = self.surface.copy()
+        self.line_surface.fill((0,255,0))
+        self.line_surface.set_colorkey((0,255,0))
+        self.line_surface.set_alpha(120)
+        
+        for col in range(1, columns):
+            x = col * cell_size
+            pygame.draw.line(self.line_surface, LINE_COLOR, (x,0), (x,self.surface.get_height()), 1)
+            
+        for row in range(1, rows):
+            y = row * cell_size
+            pygame.draw.line(self.line_surface, LINE_COLOR, (0,y), (self.surface.get_width(),y))
+            
+        self.grid_key = self.surface.get_size()
+        
+    def draw_grid(self):
+        """
+        Blits the grid lines onto surface, redrawing them if the surface
+        changed size
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        None
+        """
+        if self.grid_key != self.surface.get_size():
+            self.build_grid()
+            
+        self.surface.blit(self.line_surface, (0,0))
+        
+    def get_piece(self):
+        """
+        Returns the shape and the cells on the field of the falling piece
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        tuple
+            shape letter and list of (x, y) cells, no cells once the game
+            is over
+        """
+        piece = self.engine.piece
+        if self.engine.game_over:
+            return piece.shape, []
+        
+        return piece.shape, [(x, y) for x, y in piece.cells if 0 <= y < rows]
+        
+    def draw_changed_cells(self):
+        """
+        Draws only the cells that changed since the last frame: the rows
+        moved by a line clear, the cells of a piece that locked, and the
+        cells the falling piece left and entered
+
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        rects : list
+            display rects that were drawn
+        """
+        piece = self.get_piece()
+        cells = self.changed_cells
+        if piece != self.drawn_piece:
+            cells.update(self.drawn_piece[1])
+            cells.update(piece[1])
+            
+        if not cells and not self.changed_rows:
+            return []
+        
+        # the falling piece is drawn whole, so its cells are redrawn with it
+        cells.update(piece[1])
+        band = self.changed_rows
+        rects = [pygame.Rect(0, 0, game_width, band * cell_size)] if band else []
+        rects += [pygame.Rect(x * cell_size, y * cell_size, cell_size, cell_size)
+                  for x, y in cells if y >= band]
+        
+        for rect in rects:
+            self.surface.blit(self.settled, rect, rect)
+        self.tetromino.draw(self.surface)
+        
+        display_rects = []
+        for rect in rects:
+            self.surface.blit(self.line_surface, rect, rect)
+            display_rect = rect.move(padding, padding)
+            self.display_surface.blit(self.surface, display_rect, rect)
+            display_rects.append(display_rect)
+        
+        # edge cells cover the border
+        pygame.draw.rect(self.display_surface, LINE_COLOR, self.rect, 2, 2)
+            
+        self.drawn_piece = piece
+        self.changed_rows = 0
+        cells.clear()
+        return display_rects
+        
+    def force_redraw(self):
+        """
+        Draws everything on the next frame
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        None
+        """
+        self.drawn_piece = None
+        self.settled_pieces = None
+        
+    def input(self):
+        """
+        Checks for user input, or the next step of a replay being watched
+
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        tuple
+            left, right, up, and down key held, None once the replay has no
+            steps left
+        """
+        if self.replay_keys is not None:
+            keys = next(self.replay_keys, None)
+            self.replay_over = keys is None
+            return keys
+        
+        keys = pygame.key.get_pressed()
+        return (keys[pygame.K_LEFT], keys[pygame.K_RIGHT], keys[pygame.K_UP],
+                keys[pygame.K_DOWN])
+            
+    def keys_held(self):
+        """
+        Checks if a key that repeats while held is down
+
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        bool
+        """
+        # a replay or a bot can press keys at any step
+        if self.replay_keys is not None:
+            return not self.replay_over
+
+        if self.bot:
+            return True
+        
+        keys = pygame.key.get_pressed()
+        return keys[pygame.K_LEFT] or keys[pygame.K_RIGHT] or keys[pygame.K_UP]
+        
+    def get_timeout(self):
+        """
+        Returns the real time until the next active timer runs out
+
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        timeout : int or None
+            time in ms, None if no timer is active
+        """
+        # a finished replay waits for the user to leave
+        if self.replay_over:
+            return None
+
+        time_left = self.simulation.get_timeout()
+        if time_left is None:
+            return None
+        
+        return ceil(max(time_left - self.stepper.accumulator, 0) / self.playback_rate)
+
+    def run(self):
+        """
+        Runs the Game class
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        rects : list
+            display rects that were drawn
+        """
+        # update, in fixed steps of simulation time
+        current_ticks = pygame.time.get_ticks()
+        elapsed = (current_ticks - self.last_ticks) * self.playback_rate
+        keys = self.input() if self.replay_keys is None and not self.bot else None
+
+        for step in range(self.stepper.advance(elapsed)):
+            # a bot takes one action every step
+            if self.bot:
+                self.simulation.act(self.bot.next_action(self.engine, self.next_shapes))
+                continue
+
+            # a replay has its own keys for every step, and stops on its
+            # last one
+            if self.replay_keys is not None:
+                keys = self.input()
+                if keys is None:
+                    break
+
+            if self.recorder:
+                self.recorder.record(keys)
+            self.simulation.step(*keys)
+
+            # keys read once a frame only press on its first due step, the
+            # others carry on with the soft drop as it was
+            if self.replay_keys is None:
+                keys = (False, False, False, keys[3])
+        self.last_ticks = current_ticks
+
+        return self.draw()
+    
+    def draw(self):
+        """
+        Draws the settled blocks, the falling piece, and the grid lines,
+        only the changed cells when possible
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        rects : list
+            display rects that were drawn
+        """
+        self.update_tetromino()
+        if self.settled_pieces != self.engine.pieces_placed:
+            self.draw_field()
+        
+        if self.config.dirty_rendering and self.drawn_piece is not None:
+            return self.draw_changed_cells()
+        
+        # drawing
+        self.surface.blit(self.settled, (0,0))
+        self.tetromino.draw(self.surface)
+        
+        self.draw_grid()
+        self.display_surface.blit(self.surface, (padding,padding))
+        pygame.draw.rect(self.display_surface, LINE_COLOR, self.rect, 2, 2)
+        
+        self.drawn_piece = self.get_piece()
+        self.changed_rows = 0
+        self.changed_cells.clear()
+        return [self.rect]
+        
+class Tetromino:
+    """
+    A class to represent a Tetromino.
+
+    ...
+
+    Attributes
+    ----------
+    engine : Engine object
+        engine holding the falling piece
+    piece : Piece object
+        engine piece drawn by this tetromino
+    shape : str
+        the shape to be turned into a tetromino object
+    image : pygame Surface object
+        shared block image of the shape
+    blocks : list
+        the four blocks of the falling piece
+
+    Methods
+    -------
+    def sync():
+        moves blocks to the piece position
+        
+    def draw(surface):
+        draws the blocks onto surface
+    """
+    def __init__(self, engine, tiles):
+        """
+        Constructs all necessary attributes for the tetromino class
+
+        Parameters
+        ----------
+        engine : Engine object
+            engine holding the falling piece
+        tiles : TileAtlas object
+            one shared block image per shape
+        """
+        # setup
+        self.engine = engine
+        self.piece = engine.piece
+        self.shape = self.piece.shape
+        self.image = tiles.tiles[self.shape]
+        
+        # create blocks
+        self.blocks = [Block(pos, self.image) for pos in self.piece.cells]
+    
+    def sync(self):
+        """
+        Moves blocks to the current position of the piece
+
+        Parameters
+        ----------
+        None
+            
+        Returns
+        -------
+        None
+        """
+        for block, pos in zip(self.blocks, self.piece.cells):
+            block.pos = pos
+    
+    def draw(self, surface):
+        """
+        Draws the blocks onto a surface in one batch
+
+        Parameters
+        ----------
+        surface : pygame Surface object
+            surface of the field
+            
+        Returns
+        -------
+        None
+        """
+        surface.blits([(block.image, (block.pos[0] * cell_size, block.pos[1] * cell_size))
+                       for block in self.blocks], False)
+
+class Block:
+    """
+    A class to represent a Block of the falling piece.
+
+    Locked blocks are only shape letters in the engine's grid, so the four
+    blocks of the falling piece are the only ones kept as objects. They are
+    drawn by their Tetromino and store no rect, so nothing has to be updated
+    when they are not drawn.
+
+    ...
+
+    Attributes
+    ----------
+    pos : tuple
+        current block position in cells
+    image : pygame Surface object
+        shared tile of the block's shape
+
+    Methods
+    -------
+    None
+    """
+    __slots__ = ('pos', 'image')
+    
+    def __init__(self, pos, image):
+        """
+        Constructs all necessary attributes for the Block class
+
+        Parameters
+        ----------
+        pos : tuple
+            current block position in cells
+        image : pygame Surface object
+            shared tile of the block's shape
+        """
+        self.pos = pos
+        self.image = image
+
+class TileAtlas:
+    """
+    A class to hold one block tile per shape on a single surface.
+
+    ...
+
+    Attributes
+    ----------
+    surface : pygame Surface object
+        atlas with the tiles of all shapes side by side
+    tiles : dict
+        subsurface of the atlas for every shape letter and bitboard code
+
+    Methods
+    -------
+    None
+    """
+    def __init__(self, cell_size):
+        """
+        Constructs all necessary attributes for the TileAtlas class
+
+        Parameters
+        ----------
+        cell_size : int
+            width and height of a tile
+        """
+        self.surface = pygame.Surface((cell_size * len(tetromino_dict), cell_size))
+        self.tiles = {}
+        
+        for i, (shape, data) in enumerate(tetromino_dict.items()):
+            rect = (i * cell_size, 0, cell_size, cell_size)
+            self.surface.fill(data['color'], rect)
+            self.tiles[shape] = self.tiles[i + 1] = self.surface.subsurface(rect)
+
+class Menu():
+    """
+    A class to represent a Menu.
+
+    ...
+
+    Attributes
+    ----------
+    display_surface : pygame Surface object
+        current surface that is displayed
+    resume_button : Button object
+        button with resume function
+    quit_button : Button object
+        button with quit function
+    options_button : Button object
+        button with options function
+    video_button : Button object
+        button with video function
+    audio_button : Button object
+        button with audio function
+    keys_button : Button object
+        button with key function
+    back_button : Button object
+        button with back function
+
+    Methods
+    -------
+    None
+    """
+    def __init__(self, assets = None):
+        """
+        Constructs all necessary attributes for the Menu class
+
+        Parameters
+        ----------
+        assets : AssetManager object
+            loads the button images, the shared one if None
+        display_surface : pygame Surface object
+            current surface that is displayed
+        resume_button : Button object
+            button with resume function
+        quit_button : Button object
+            button with quit function
+        options_button : Button object
+            button with options function
+        video_button : Button object
+            button with video function
+        audio_button : Button object
+            button with audio function
+        keys_button : Button object
+            button with key function
+        back_button : Button object
+            button with back function
+        """
+        self.display_surface = pygame.display.get_surface()
+        
+        # load button images
+        assets = assets or get_assets()
+        (resume_img, options_img, quit_img, video_img, audio_img, keys_img,
+         back_img) = [assets.image(name) for name in MENU_IMAGES]
+
+        # Create button instances for main menu
+        self.resume_button = Button(game_width / 1.6, game_height / 5, resume_img, 1)
+        self.quit_button = Button(game_width / 1.5, game_height / 5 * 3, quit_img, 1)
+        self.options_button = Button(game_width / 1.6, game_height / 5 * 2, options_img, 1)
+        
+        # Button instances for options
+        self.video_button = Button(game_width / 2, game_height / 5, video_img, 1)
+        self.audio_button = Button(game_width / 2, game_height / 5 * 2, audio_img, 1)
+        self.keys_button = Button(game_width / 2, game_height / 5 * 3, keys_img, 1)
+        self.back_button = Button(game_width / 1.4, game_height / 5 * 4, back_img, 1)
+        
+class Button():
+    """
+    A class to represent a Button.
+
+    ...
+
+    Attributes
+    ----------
+    image : pygame surface object
+        image transformed into scaled surface
+    rect : tuple
+        center position of image
+    clicked : bool
+        state of wether mouse is clicked or not
+
+    Methods
+    -------
+    def draw(surface):
+        draws image/text onto surface
+    """
+    def __init__(self, x, y, image, scale):
+        """
+        Constructs all necessary attributes for the Button class
+
+        Parameters
+        ----------
+        image : pygame surface object
+            image transformed into scaled surface
+        rect : tuple
+            center position of image
+        clicked : bool
+            state of wether mouse is clicked or not
+        x : int
+            x position
+        y : int
+            y position
+        scale : int
+            scale set for image
+        """
+        width = image.get_width()
+        height = image.get_height()
+        self.image = pygame.transform.scale(image, (int(width * scale), 
+                                                 int(height * scale)))
+        self.rect = self.image.get_rect(center = (x,y))
+        self.rect.topleft = (x, y)
+        self.clicked = False
+    
+    def draw(self, surface):
+        """
+        Draws image/text onto surface
+        
+        Parameters
+        ----------
+        surface : pygame Surface object
+            the surface to be drawn, None to only check for a click
+        
+        Returns
+        -------
+        action : bool
+            representation of completed click
+        """
+        action = False
+  		#get mouse position
+        pos = pygame.mouse.get_pos()
+  
+  		#check mouseover and clicked conditions
+        if self.rect.collidepoint(pos):
+            if pygame.mouse.get_pressed()[0] == 1 and self.clicked == False:
+                self.clicked = True
+                action = True
+  
+        if pygame.mouse.get_pressed()[0] == 0:
+            self.clicked = False
+  
+  		#draw button on screen
+        if surface is not None:
+            surface.blit(self.image, (self.rect.x, self.rect.y))
+
+        
+        return action
+
+def build_panel_background(size):
+    """
+    Draws the background and border of a side panel once
+
+    Parameters
+    ----------
+    size : tuple
+        width and height of the panel
+
+    Returns
+    -------
+    background : pygame Surface object
+        filled panel with its border
+    inner_rect : pygame Rect object
+        area inside the border that content may be drawn on
+    """
+    background = pygame.Surface(size)
+    background.fill(DARK_PURPLE)
+    pygame.draw.rect(background, LINE_COLOR, background.get_rect(), 2, 2)
+    
+    return background, background.get_rect().inflate(-4, -4)
+
+class Preview:
+    """
+    A class to represent a Preview.
+
+    ...
+
+    Attributes
+    ----------
+    surface : pygame surface object
+        surface representing where the preview goes
+    rect : tuple
+        topright of the surface
+    display_surface : pygame surface object
+        current surface of display
+    shape_surfaces: dict
+        loads images for upcoming shapes
+    increment_height : int
+        height position for placing preview shapes
+    background : pygame surface object
+        background and border, drawn once and reused every frame
+    inner_rect : pygame Rect object
+        area inside the border
+    drawn_shapes : tuple
+        shapes currently on screen, None before a full redraw
+    dirty_rendering : bool
+        redraws only when the shapes change, every frame if False
+
+    Methods
+    -------
+    def display_pieces(shapes):
+        displays pieces onto surface
+    
+    def force_redraw():
+        draws everything on the next frame
+    
+    def run(next_shapes):
+        runs the Preview class
+    """
+    def __init__(self, depth = preview_depth, assets = None, dirty_rendering = dirty_rendering):
+        """
+        Constructs all necessary attributes for the Button class
+
+        Parameters
+        ----------
+        depth : int
+            number of upcoming shapes shown
+        assets : AssetManager object
+            loads the shape images, the shared one if None
+        dirty_rendering : bool
+            redraws only when the shapes change, every frame if False
+        surface : pygame surface object
+            surface representing where the preview goes
+        rect : tuple
+            topright of the surface
+        display_surface : pygame surface object
+            current surface of display
+        shape_surfaces: dict
+            loads images for upcoming shapes
+        increment_height : int
+            height position for placing preview shapes
+        background : pygame surface object
+            background and border, drawn once and reused every frame
+        inner_rect : pygame Rect object
+            area inside the border
+        drawn_shapes : tuple
+            shapes currently on screen, None before a full redraw
+        """
+        # general
+        self.surface =pygame.Surface((sidebar_width,game_height * preview_height_frac))
+        self.rect = self.surface.get_rect(topright = (window_width - padding,padding))
+        self.display_surface = pygame.display.get_surface()
+        self.background, self.inner_rect = build_panel_background(self.surface.get_size())
+        
+        # shapes
+        assets = assets or get_assets()
+        self.shape_surfaces = {shape: assets.image(name) for shape, name in zip(tetromino_dict, SHAPE_IMAGES)}
+        
+        # image position data
+        self.increment_height = self.surface.get_height() / max(depth, 1)
+        
+        # rendering
+        self.drawn_shapes = None
+        self.dirty_rendering = dirty_rendering
+        
+    def display_pieces(self, shapes):
+        """
+        Displays pieces onto surface
+        
+        Parameters
+        ----------
+        shapes : list
+            upcoming shapes to be displayed
+        
+        Returns
+        -------
+        None
+        """
+        for i, shape in enumerate(shapes):
+            shape_surface = self.shape_surfaces[shape]
+            
+            x = self.surface.get_width() / 2
+            y = self.increment_height / 2 + i * self.increment_height
+            
+            rect = shape_surface.get_rect(center = (x,y))
+            self.surface.blit(shape_surface, rect)
+        
+    def force_redraw(self):
+        """
+        Draws everything on the next frame
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.drawn_shapes = None
+        
+    def run(self, next_shapes):
+        """
+        Runs the Preview class
+        
+        Parameters
+        ----------
+        next_shapes : list
+            upcoming shapes to be displayed
+        
+        Returns
+        -------
+        rects : list
+            display rects that were drawn
+        """
+        shapes = tuple(next_shapes)
+        if self.dirty_rendering and shapes == self.drawn_shapes:
+            return []
+        
+        self.surface.blit(self.background, (0,0))
+        self.surface.set_clip(self.inner_rect)
+        self.display_pieces(next_shapes)
+        self.surface.set_clip(None)
+        self.display_surface.blit(self.surface,self.rect)
+        
+        self.drawn_shapes = shapes
+        return [self.rect]
+
+class Score:
+    """
+    A class to represent a Score.
+
+    ...
+
+    Attributes
+    ----------
+    surface : pygame surface object
+        surface representing where the score goes
+    rect : tuple
+        topright of the surface
+    display_surface : pygame surface object
+        current surface of display
+    font : Font object
+        loads font to be used
+    text_cache : TextCache object
+        rendered labels reused while their values do not change
+    increment_height : int
+        height position for placing user attributes
+    score : int
+        user score
+    level : int
+        user level
+    lines : int
+        number of lines cleared
+    background : pygame surface object
+        background and border, drawn once and reused every frame
+    inner_rect : pygame Rect object
+        area inside the border
+    drawn_values : tuple
+        score, level, and lines on screen, None before a full redraw
+    dirty_rendering : bool
+        redraws only when the values change, every frame if False
+
+    Methods
+    -------
+    def display_text(pos, text):
+        displays text onto surface
+    
+    def force_redraw():
+        draws everything on the next frame
+    
+    def run(next_shapes):
+        runs the Score class
+    """
+    def __init__(self, assets = None, dirty_rendering = dirty_rendering,
+                 text_cache_size = text_cache_size):
+        """
+        Constructs all necessary attributes for the Timer class
+
+        Parameters
+        ----------
+        assets : AssetManager object
+            loads the font, the shared one if None
+        dirty_rendering : bool
+            redraws only when the values change, every frame if False
+        text_cache_size : int
+            rendered labels kept
+        surface : pygame surface object
+            surface representing where the score goes
+        rect : tuple
+            topright of the surface
+        display_surface : pygame surface object
+            current surface of display
+        font : Font object
+            loads font to be used
+        text_cache : TextCache object
+            rendered labels reused while their values do not change
+        increment_height : int
+            height position for placing user attributes
+        score : int
+            user score
+        level : int
+            user level
+        lines : int
+            number of lines cleared
+        background : pygame surface object
+            background and border, drawn once and reused every frame
+        inner_rect : pygame Rect object
+            area inside the border
+        drawn_values : tuple
+            score, level, and lines on screen, None before a full redraw
+        dirty_rendering : bool
+            redraws only when the values change, every frame if False
+        """
+        self.surface =pygame.Surface((sidebar_width,game_height * 
+                                      score_height_frac - padding))
+        self.rect = self.surface.get_rect(bottomright = (window_width - 
+                                            padding,window_height - padding))
+        self.display_surface = pygame.display.get_surface()
+        self.background, self.inner_rect = build_panel_background(self.surface.get_size())
+        
+        # font
+        self.font = (assets or get_assets()).font(FONT, 30)
+        self.text_cache = TextCache(self.font, 'white', text_cache_size)
+        
+        # increment
+        self.increment_height = self.surface.get_height() / 3
+        
+        # data
+        self.score = 0
+        self.level = 1
+        self.lines = 0
+        
+        # rendering
+        self.drawn_values = None
+        self.dirty_rendering = dirty_rendering
+        
+    def display_text(self, pos, text):
+        """
+        Displays text inputted onto surface
+        
+        Parameters
+        ----------
+        pos : tuple
+            position to draw text
+        
+        text : str
+            text to be drawn
+        
+        Returns
+        -------
+        None
+        """
+        text_surface = self.text_cache.get(*text)
+        text_rect = text_surface.get_rect(center = pos)
+        self.surface.blit(text_surface, text_rect)
+        
+    def force_redraw(self):
+        """
+        Draws everything on the next frame
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.drawn_values = None
+        
+    def run(self):
+        """
+        Runs the Score class
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        rects : list
+            display rects that were drawn
+        """
+        values = (self.score, self.level, self.lines)
+        if self.dirty_rendering and values == self.drawn_values:
+            return []
+        
+        self.surface.blit(self.background, (0,0))
+        self.surface.set_clip(self.inner_rect)
+        for i, text in enumerate([('Score', self.score), ('Level', self.level),
+                                  ('Lines', self.lines)]):
+            x = self.surface.get_width() / 2
+            y = self.increment_height / 2 + i * self.increment_height
+            
+            self.display_text((x,y), text)
+        
+        self.surface.set_clip(None)
+        self.display_surface.blit(self.surface,self.rect)
+        
+        self.drawn_values = values
+        return [self.rect]
+
+class TextCache:
+    """
+    A class to keep rendered text surfaces.
+
+    ...
+
+    Attributes
+    ----------
+    font : Font object
+        font used to render text
+    color : str
+        color of the text
+    max_size : int
+        number of surfaces kept before the least recently used is dropped
+    surfaces : OrderedDict
+        rendered surfaces keyed by label and value, most recent last
+
+    Methods
+    -------
+    def get(label, value):
+        returns the rendered surface for a label and value
+    """
+    def __init__(self, font, color, max_size):
+        """
+        Constructs all necessary attributes for the TextCache class
+
+        Parameters
+        ----------
+        font : Font object
+            font used to render text
+        color : str
+            color of the text
+        max_size : int
+            number of surfaces kept before the least recently used is dropped
+        """
+        self.font = font
+        self.color = color
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        
+    def get(self, label, value):
+        """
+        Returns the surface for a label and value, rendering it if needed
+        
+        Parameters
+        ----------
+        label : str
+            name shown before the value
+        value : int
+            value shown after the label
+        
+        Returns
+        -------
+        text_surface : pygame Surface object
+            rendered text
+        """
+        key = (label, value)
+        text_surface = self.surfaces.get(key)
+        
+        if text_surface is None:
+            text_surface = self.font.render(f'{label}: {value}', True, self.color)
+            self.surfaces[key] = text_surface
+            if len(self.surfaces) > self.max_size:
+                self.surfaces.popitem(last = False)
+                
+        else:
+            self.surfaces.move_to_end(key)
+            
+        return text_surface
+
+class ProfileOverlay:
+    """
+    A class to show the frame times over the top left of the field.
+
+    ...
+
+    Attributes
+    ----------
+    labels : tuple
+        section and the name shown for it, in the order shown
+    profiler : FrameProfiler object
+        profiler whose times are shown
+    font : Font object
+        loads font to be used
+    line_height : int
+        height of a line of text
+    surface : pygame surface object
+        surface the times are drawn on
+    rect : pygame Rect object
+        area of the display covered
+    display_surface : pygame surface object
+        current surface of display
+    refresh_time : int
+        time in ms between updates of the text
+    last_refresh : int
+        time of the last update of the text, None before the first
+
+    Methods
+    -------
+    def refresh():
+        draws the latest times onto surface
+    
+    def run():
+        runs the ProfileOverlay class
+    """
+    labels = (('input', 'input'), ('timer_update', 'timers'),
+              ('piece_update', 'piece'), ('draw', 'draw'),
+              ('display_update', 'display'))
+    
+    def __init__(self, profiler, refresh_time = 250, assets = None):
+        """
+        Constructs all necessary attributes for the ProfileOverlay class
+
+        Parameters
+        ----------
+        profiler : FrameProfiler object
+            profiler whose times are shown
+        refresh_time : int
+            time in ms between updates of the text
+        assets : AssetManager object
+            loads the font, the shared one if None
+        """
+        self.profiler = profiler
+        self.font = (assets or get_assets()).font(FONT, 13)
+        self.line_height = self.font.get_linesize()
+        width = self.font.size("p50 00.00  p95 00.00  p99 00.00 ms")[0] + 8
+        self.surface = pygame.Surface((width, self.line_height * (len(self.labels) + 2) + 8))
+        self.rect = self.surface.get_rect(topleft = (padding + 2, padding + 2))
+        self.display_surface = pygame.display.get_surface()
+        self.refresh_time = refresh_time
+        self.last_refresh = None
+        
+    def refresh(self):
+        """
+        Draws the latest percentiles and section times onto surface
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        summary = self.profiler.summary()
+        lines = [
+            "p50 {:.2f}  p95 {:.2f}  p99 {:.2f} ms".format(
+                summary['p50'], summary['p95'], summary['p99']),
+            "dropped {} of {} at {} fps".format(
+                summary['dropped'], summary['frames'], self.profiler.target_fps)
+        ]
+        for name, label in self.labels:
+            lines.append("{} {:.3f} ms".format(label, summary['sections'][name]))
+            
+        self.surface.fill(GRAY)
+        for i, line in enumerate(lines):
+            text_surface = self.font.render(line, True, 'white')
+            self.surface.blit(text_surface, (4, 4 + i * self.line_height))
+        
+    def run(self):
+        """
+        Runs the ProfileOverlay class, drawn every frame since the field
+        under it may have changed
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        rects : list
+            display rects that were drawn
+        """
+        ticks = pygame.time.get_ticks()
+        if self.last_refresh is None or ticks - self.last_refresh >= self.refresh_time:
+            self.refresh()
+            self.last_refresh = ticks
+            
+        self.display_surface.blit(self.surface, self.rect)
+        return [self.rect]
+
+class SoundEffects:
+    """
+    A class to play short sound effects on channels kept for them.
+
+    ...
+
+    Attributes
+    ----------
+    sounds : dict
+        decoded sound by effect name, only the effects whose file exists
+    channels : list
+        mixer channels reserved for the effects, empty to play on any free
+        channel
+    next_channel : int
+        index of the channel the next effect plays on
+
+    Methods
+    -------
+    def play(name):
+        plays an effect
+    """
+    def __init__(self, assets = None, effects = sound_effects, channels = sound_channels,
+                 volume = sound_volume):
+        """
+        Constructs all necessary attributes for the SoundEffects class
+
+        Parameters
+        ----------
+        assets : AssetManager object
+            loads the sounds, the shared one if None
+        effects : dict
+            file of every effect relative to the repository root
+        channels : int
+            mixer channels to reserve for the effects, 0 to play them on any
+            free channel
+        volume : float
+            volume of every effect from 0 to 1
+        """
+        assets = assets or get_assets()
+        self.sounds = {}
+        for name, path in effects.items():
+            # effects are optional, the game ships without them
+            if os.path.exists(assets.path(path)):
+                self.sounds[name] = assets.sound(path)
+                self.sounds[name].set_volume(volume)
+        
+        # reserved channels are never taken by Sound.play, and taking them in
+        # turn means an effect only ever cuts off the oldest one
+        channels = min(channels, pygame.mixer.get_num_channels()) if self.sounds else 0
+        pygame.mixer.set_reserved(channels)
+        self.channels = [pygame.mixer.Channel(index) for index in range(channels)]
+        self.next_channel = 0
+        
+    def play(self, name):
+        """
+        Plays an effect on the channel that started playing the longest ago
+        
+        Parameters
+        ----------
+        name : str
+            name of the effect, nothing is played if it has no file
+        
+        Returns
+        -------
+        None
+        """
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        
+        # with no channels kept, Sound.play takes any free one
+        if not self.channels:
+            sound.play()
+            return
+        
+        self.channels[self.next_channel].play(sound)
+        self.next_channel = (self.next_channel + 1) % len(self.channels)
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+
+"""
+Asset loading.
+
+Images are decoded on a thread pool as soon as they are asked for, so the
+files of the menu and the side panels load side by side instead of one after
+another while pygame opens the window. Decoded images are kept for the life of
+the process, keyed by path and scale, fonts by path and size, and short sound
+effects by path. Music is not loaded here, the front end streams it from its
+file instead of holding it decoded in memory. With a cache folder every decoded
+and scaled image is also written there as compressed RGBA pixels, which the
+next start reads back several times faster than it can decode the PNG; an
+entry is rebuilt when its source file changes.
+
+Paths are relative to the repository root, so the game starts from any folder.
+Only the pygame front end imports this module.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+import struct
+import zlib
+
+import pygame
+
+from .settings import asset_cache, asset_workers
+
+# folder holding graphics, images and music
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# width and height at the start of a cache file
+HEADER = struct.Struct('<II')
+
+class AssetManager:
+    """
+    A class to load and keep the images and fonts of the game.
+
+    ...
+
+    Attributes
+    ----------
+    root : str
+        folder the asset paths are relative to
+    cache_folder : str
+        folder decoded images are kept in between starts, None for no cache
+    executor : ThreadPoolExecutor object
+        decodes images, None to decode on the calling thread
+    images : dict
+        converted surface by path and scale
+    pending : dict
+        future of the decoded surface by path and scale, while decoding
+    fonts : dict
+        font by path and size
+    sounds : dict
+        decoded sound effect by path
+
+    Methods
+    -------
+    def path(name):
+        returns the full path of an asset
+
+    def preload(names, scale):
+        starts decoding images in the background
+
+    def image(name, scale):
+        returns an image, converted for the display
+
+    def font(name, size):
+        returns a font
+
+    def sound(name):
+        returns a decoded sound effect
+
+    def cache_file(path, scale):
+        returns the cache file of an image
+
+    def decode(path, scale):
+        reads an image from the cache or its file
+
+    def close():
+        stops the decoding threads
+    """
+    def __init__(self, root = ROOT, cache_folder = asset_cache, workers = asset_workers):
+        """
+        Constructs all necessary attributes for the AssetManager class
+
+        Parameters
+        ----------
+        root : str
+            folder the asset paths are relative to
+        cache_folder : str
+            folder to keep decoded images in between starts, relative to
+            root, None for no cache
+        workers : int
+            threads decoding images, 0 to decode on the calling thread
+        """
+        self.root = root
+        self.cache_folder = os.path.join(root, cache_folder) if cache_folder else None
+        self.executor = ThreadPoolExecutor(workers) if workers else None
+        self.images = {}
+        self.pending = {}
+        self.fonts = {}
+        self.sounds = {}
+
+    def path(self, name):
+        """
+        Returns the full path of an asset
+
+        Parameters
+        ----------
+        name : str
+            path relative to root, such as 'images/button_quit.png'
+
+        Returns
+        -------
+        str
+        """
+        return os.path.join(self.root, name)
+
+    def preload(self, names, scale = 1):
+        """
+        Starts decoding images in the background
+
+        Parameters
+        ----------
+        names : iterable
+            paths of the images relative to root
+        scale : float
+            size of the images compared to their files
+
+        Returns
+        -------
+        None
+        """
+        if self.executor is None:
+            return
+
+        for name in names:
+            key = (name, scale)
+            if key not in self.images and key not in self.pending:
+                self.pending[key] = self.executor.submit(self.decode, self.path(name), scale)
+
+    def image(self, name, scale = 1):
+        """
+        Returns an image converted for the display, waiting for it if it is
+        still being decoded and decoding it if it was never asked for
+
+        Parameters
+        ----------
+        name : str
+            path of the image relative to root
+        scale : float
+            size of the image compared to its file
+
+        Returns
+        -------
+        image : pygame Surface object
+            shared by every caller, copy it before drawing on it
+        """
+        key = (name, scale)
+        image = self.images.get(key)
+        if image is None:
+            future = self.pending.pop(key, None)
+            decoded = future.result() if future else self.decode(self.path(name), scale)
+            # the pixel format of the display is only known on this thread
+            image = self.images[key] = decoded.convert_alpha()
+
+        return image
+
+    def font(self, name, size):
+        """
+        Returns a font, loading it once for every size
+
+        Parameters
+        ----------
+        name : str
+            path of the font file relative to root
+        size : int
+            height of the font in pixels
+
+        Returns
+        -------
+        pygame Font object
+        """
+        key = (name, size)
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.Font(self.path(name), size)
+
+        return self.fonts[key]
+
+    def sound(self, name):
+        """
+        Returns a sound effect, decoding it once
+
+        Parameters
+        ----------
+        name : str
+            path of the sound file relative to root
+
+        Returns
+        -------
+        pygame Sound object
+        """
+        if name not in self.sounds:
+            self.sounds[name] = pygame.mixer.Sound(self.path(name))
+
+        return self.sounds[name]
+
+    def cache_file(self, path, scale):
+        """
+        Returns the cache file of an image, named after its path, scale, size
+        and modification time so a changed file gets a new entry
+
+        Parameters
+        ----------
+        path : str
+            full path of the image
+        scale : float
+            size of the image compared to its file
+
+        Returns
+        -------
+        str or None
+            None if there is no cache folder
+        """
+        if not self.cache_folder:
+            return None
+
+        stat = os.stat(path)
+        key = '{}|{}|{}|{}'.format(path, scale, stat.st_size, stat.st_mtime_ns)
+        return os.path.join(self.cache_folder, hashlib.sha1(key.encode()).hexdigest() + '.rgba')
+
+    def decode(self, path, scale = 1):
+        """
+        Reads an image from the cache folder, or decodes and scales its file
+        and adds it to the cache
+
+        Parameters
+        ----------
+        path : str
+            full path of the image
+        scale : float
+            size of the image compared to its file
+
+        Returns
+        -------
+        image : pygame Surface object
+            not yet converted for the display
+        """
+        cache_file = self.cache_file(path, scale)
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'rb') as file:
+                    data = file.read()
+                size = HEADER.unpack_from(data)
+                return pygame.image.frombytes(zlib.decompress(data[HEADER.size:]), size, 'RGBA')
+
+            except (OSError, ValueError, struct.error, zlib.error):
+                # a broken entry is decoded and written again
+                pass
+
+        image = pygame.image.load(path)
+        if scale != 1:
+            image = pygame.transform.scale(image, (int(image.get_width() * scale),
+                                                   int(image.get_height() * scale)))
+
+        if cache_file:
+            data = HEADER.pack(*image.get_size()) + zlib.compress(
+                pygame.image.tobytes(image, 'RGBA'), 1)
+            try:
+                os.makedirs(self.cache_folder, exist_ok = True)
+                # written under another name first so a reader never sees half
+                # a file
+                temp_file = '{}.{}.tmp'.format(cache_file, os.getpid())
+                with open(temp_file, 'wb') as file:
+                    file.write(data)
+                os.replace(temp_file, cache_file)
+
+            except OSError:
+                # a read-only disk only costs the next start its head start
+                pass
+
+        return image
+
+    def close(self):
+        """
+        Stops the decoding threads
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait = False)
+            self.executor = None
+
+# managers kept by this process, one per cache folder
+managers = {}
+
+def get_assets(cache_folder = asset_cache, workers = asset_workers):
+    """
+    Returns this process's asset manager for a cache folder, creating it once
+
+    Parameters
+    ----------
+    cache_folder : str
+        folder to keep decoded images in between starts, None for no cache
+    workers : int
+        threads decoding images, used when the manager is created
+
+    Returns
+    -------
+    AssetManager object
+    """
+    if cache_folder not in managers:
+        managers[cache_folder] = AssetManager(cache_folder = cache_folder, workers = workers)
+
+    return managers[cache_folder]
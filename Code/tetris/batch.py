@@ -0,0 +1,482 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batched engine.
+
+Runs many games at once with NumPy. Every board is a row of bitmasks in one
+(boards x rows) array, and the falling pieces are arrays of shape, rotation and
+position, so moves, drops, collisions, line clears and scoring are applied to
+all boards in a handful of vectorized operations. The rules are the same as in
+engine.Engine: pieces spawn at block_offset, rotate with the tables from
+tetris.rotations, score with SCORE_DATA, and level up every 10 lines. There is
+no timed gravity; a piece only falls on a DOWN or DROP action or in place().
+
+NumPy is only needed by this module; the rest of the package runs without it.
+"""
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("tetris.batch needs numpy, install it with "
+                      "'pip install numpy'") from error
+
+from .engine import LEFT, RIGHT, ROTATE, DOWN, DROP
+from .randomizer import SHAPES
+from .rotations import ROTATIONS, FOOTPRINTS
+from .settings import columns, rows, block_offset, SCORE_DATA
+
+# footprint tables indexed by [shape, rotation]
+LEFT_EDGE = np.array([[FOOTPRINTS[s][r][0] for r in range(4)] for s in SHAPES])
+RIGHT_EDGE = np.array([[FOOTPRINTS[s][r][1] for r in range(4)] for s in SHAPES])
+TOP_EDGE = np.array([[FOOTPRINTS[s][r][2] for r in range(4)] for s in SHAPES])
+HEIGHT = np.array([[len(FOOTPRINTS[s][r][3]) for r in range(4)] for s in SHAPES])
+MASKS = np.array([[list(FOOTPRINTS[s][r][3]) + [0] * (4 - len(FOOTPRINTS[s][r][3]))
+                   for r in range(4)] for s in SHAPES])
+
+# cell offsets indexed by [shape, rotation, block]
+CELL_DX = np.array([[[dx for dx, dy in ROTATIONS[s][r]] for r in range(4)] for s in SHAPES])
+CELL_DY = np.array([[[dy for dx, dy in ROTATIONS[s][r]] for r in range(4)] for s in SHAPES])
+
+# lowest cell of every footprint column, indexed by [shape, rotation, column]
+NO_CELL = -100
+BOTTOM = np.full((len(SHAPES), 4, 4), NO_CELL)
+for s, shape in enumerate(SHAPES):
+    for r in range(4):
+        for dx, dy in ROTATIONS[shape][r]:
+            c = dx - LEFT_EDGE[s, r]
+            BOTTOM[s, r, c] = max(BOTTOM[s, r, c], dy)
+
+SCORES = np.array([0] + [SCORE_DATA[lines] for lines in range(1, 5)])
+O_SHAPE = SHAPES.index('O')
+
+class BatchEngine:
+    """
+    A class to run many games at once with NumPy.
+
+    ...
+
+    Attributes
+    ----------
+    num_boards : int
+        number of games
+    columns : int
+        width of every field
+    rows : int
+        height of every field
+    full_mask : int
+        bitmask of a full row
+    rng : Generator object
+        NumPy source of random numbers
+    kind : str
+        'uniform' or 'bag'
+    boards : ndarray
+        (boards x rows) row bitmasks
+    tops : ndarray
+        (boards x columns) first occupied row of every column, rows if empty
+    shape : ndarray
+        shape index of every falling piece, into SHAPES
+    rotation : ndarray
+        rotation of every falling piece
+    x : ndarray
+        pivot column of every falling piece
+    y : ndarray
+        pivot row of every falling piece
+    next_shapes : ndarray
+        (boards x depth) upcoming shape indexes
+    score : ndarray
+        score of every game
+    lines : ndarray
+        lines cleared in every game
+    level : ndarray
+        level of every game
+    pieces_placed : ndarray
+        pieces locked in every game
+    game_over : ndarray
+        True for games that have ended
+
+    Methods
+    -------
+    def reset(which):
+        starts new games on some or all boards
+
+    def collides(shape, rotation, x, y):
+        checks pieces against the boards
+
+    def drop_rows(shape, rotation, x):
+        returns the landing row of pieces dropped from above
+
+    def lock(which):
+        locks pieces, clears lines, scores, and spawns the next pieces
+
+    def place(rotation, x):
+        drops every piece from above at a rotation and column
+
+    def step(actions):
+        applies one action to every game
+    """
+    def __init__(self, num_boards, seed = None, kind = 'bag', depth = 3,
+                 columns = columns, rows = rows):
+        """
+        Constructs all necessary attributes for the BatchEngine class
+
+        Parameters
+        ----------
+        num_boards : int
+            number of games
+        seed : int
+            seed of the random numbers, random if None
+        kind : str
+            'uniform' or 'bag'
+        depth : int
+            number of upcoming shapes kept for every game
+        columns : int
+            width of every field, at most 31
+        rows : int
+            height of every field
+        """
+        if kind not in ('uniform', 'bag'):
+            raise ValueError("batched randomizer must be 'uniform' or 'bag', not {!r}".format(kind))
+
+        self.num_boards = num_boards
+        self.columns = columns
+        self.rows = rows
+        self.full_mask = (1 << columns) - 1
+        self.rng = np.random.default_rng(seed)
+        self.kind = kind
+
+        # boards
+        self.boards = np.zeros((num_boards, rows), np.int32)
+        self.tops = np.full((num_boards, columns), rows, np.int32)
+
+        # pieces
+        self.shape = np.zeros(num_boards, np.int64)
+        self.rotation = np.zeros(num_boards, np.int64)
+        self.x = np.zeros(num_boards, np.int64)
+        self.y = np.zeros(num_boards, np.int64)
+        self.next_shapes = np.zeros((num_boards, depth + 1), np.int64)
+        self.bags = np.zeros((num_boards, len(SHAPES)), np.int64)
+        self.bag_pos = np.zeros(num_boards, np.int64)
+
+        # score
+        self.score = np.zeros(num_boards, np.int64)
+        self.lines = np.zeros(num_boards, np.int64)
+        self.level = np.ones(num_boards, np.int64)
+        self.pieces_placed = np.zeros(num_boards, np.int64)
+        self.game_over = np.zeros(num_boards, bool)
+
+        self.reset()
+
+    def deal(self, which):
+        """
+        Deals one shape index to each chosen board
+
+        Parameters
+        ----------
+        which : ndarray
+            indexes of the boards
+
+        Returns
+        -------
+        ndarray
+        """
+        if self.kind == 'uniform':
+            return self.rng.integers(0, len(SHAPES), len(which))
+
+        empty = which[self.bag_pos[which] == 0]
+        if len(empty):
+            self.bags[empty] = self.rng.permuted(
+                np.tile(np.arange(len(SHAPES)), (len(empty), 1)), axis = 1)
+
+        shapes = self.bags[which, self.bag_pos[which]]
+        self.bag_pos[which] = (self.bag_pos[which] + 1) % len(SHAPES)
+        return shapes
+
+    def spawn(self, which):
+        """
+        Moves the next shape of each chosen board to the spawn point
+
+        Parameters
+        ----------
+        which : ndarray
+            indexes of the boards
+
+        Returns
+        -------
+        None
+        """
+        self.shape[which] = self.next_shapes[which, 0]
+        self.next_shapes[which, :-1] = self.next_shapes[which, 1:]
+        self.next_shapes[which, -1] = self.deal(which)
+        self.rotation[which] = 0
+        self.x[which] = block_offset[0] + (self.columns - columns) // 2
+        self.y[which] = block_offset[1]
+
+    @property
+    def preview(self):
+        """
+        Upcoming shapes of every game, not counting the falling piece
+
+        Returns
+        -------
+        ndarray
+        """
+        return self.next_shapes[:, :-1]
+
+    def reset(self, which = None):
+        """
+        Starts new games on the chosen boards
+
+        Parameters
+        ----------
+        which : ndarray
+            boolean mask or indexes of the boards, all boards if None
+
+        Returns
+        -------
+        None
+        """
+        which = np.arange(self.num_boards) if which is None else np.flatnonzero(
+            which) if np.asarray(which).dtype == bool else np.asarray(which)
+
+        self.boards[which] = 0
+        self.tops[which] = self.rows
+        self.score[which] = 0
+        self.lines[which] = 0
+        self.level[which] = 1
+        self.pieces_placed[which] = 0
+        self.game_over[which] = False
+        self.bag_pos[which] = 0
+
+        for i in range(self.next_shapes.shape[1]):
+            self.next_shapes[which, i] = self.deal(which)
+        self.spawn(which)
+
+    def collides(self, shape, rotation, x, y):
+        """
+        Checks if pieces are outside their fields or on occupied cells
+
+        Parameters
+        ----------
+        shape : ndarray
+            shape index of every piece
+        rotation : ndarray
+            rotation of every piece
+        x : ndarray
+            pivot column of every piece
+        y : ndarray
+            pivot row of every piece
+
+        Returns
+        -------
+        ndarray
+            True where a piece collides
+        """
+        shift = x + LEFT_EDGE[shape, rotation]
+        walls = (shift < 0) | (x + RIGHT_EDGE[shape, rotation] >= self.columns)
+        top = y + TOP_EDGE[shape, rotation]
+        floor = top + HEIGHT[shape, rotation] > self.rows
+
+        # one row of the board for every row of the footprint
+        row_index = top[:, None] + np.arange(4)
+        rows_used = (row_index >= 0) & (row_index < self.rows)
+        board_rows = np.take_along_axis(self.boards, row_index.clip(0, self.rows - 1), 1)
+        masks = MASKS[shape, rotation] << shift.clip(0)[:, None]
+        overlap = ((board_rows & masks) != 0) & rows_used
+
+        return walls | floor | overlap.any(1)
+
+    def drop_rows(self, shape, rotation, x):
+        """
+        Returns the row every piece lands on when dropped from above
+
+        Parameters
+        ----------
+        shape : ndarray
+            shape index of every piece
+        rotation : ndarray
+            rotation of every piece
+        x : ndarray
+            pivot column of every piece, inside the walls
+
+        Returns
+        -------
+        ndarray
+            pivot row of every piece after the drop
+        """
+        bottom = BOTTOM[shape, rotation]
+        column = (x + LEFT_EDGE[shape, rotation])[:, None] + np.arange(4)
+        tops = np.take_along_axis(self.tops, column.clip(0, self.columns - 1), 1)
+        landing = np.where(bottom == NO_CELL, self.rows, tops - 1 - bottom)
+        return landing.min(1)
+
+    def lock(self, which):
+        """
+        Locks the pieces of the chosen boards, clears full rows, scores,
+        and spawns the next pieces
+
+        Parameters
+        ----------
+        which : ndarray
+            indexes of the boards
+
+        Returns
+        -------
+        cleared : ndarray
+            number of rows cleared on each chosen board
+        """
+        shape = self.shape[which]
+        rotation = self.rotation[which]
+        cell_x = self.x[which, None] + CELL_DX[shape, rotation]
+        cell_y = self.y[which, None] + CELL_DY[shape, rotation]
+
+        # place the blocks, a block above the field ends the game
+        above = (cell_y < 0).any(1)
+        for block in range(4):
+            inside = cell_y[:, block] >= 0
+            boards, bx, by = which[inside], cell_x[inside, block], cell_y[inside, block]
+            self.boards[boards, by] |= (1 << bx).astype(np.int32)
+            self.tops[boards, bx] = np.minimum(self.tops[boards, bx], by)
+        self.pieces_placed[which] += 1
+
+        # clear full rows
+        full = self.boards[which] == self.full_mask
+        cleared = full.sum(1)
+        if cleared.any():
+            self.clear_rows(which[cleared > 0], full[cleared > 0], cleared[cleared > 0])
+            self.calculate_score(which, cleared)
+
+        self.game_over[which[above]] = True
+        self.spawn(which[~above])
+        return cleared
+
+    def clear_rows(self, which, full, cleared):
+        """
+        Removes full rows and moves the rows above them down
+
+        Parameters
+        ----------
+        which : ndarray
+            indexes of boards with at least one full row
+        full : ndarray
+            (boards x rows) True for full rows
+        cleared : ndarray
+            number of full rows on each board
+
+        Returns
+        -------
+        None
+        """
+        # stable sort puts the full rows on top, the rest keep their order
+        order = np.argsort(~full, axis = 1, kind = 'stable')
+        boards = np.take_along_axis(self.boards[which], order, 1)
+        boards[np.arange(self.rows) < cleared[:, None]] = 0
+        self.boards[which] = boards
+
+        # column tops from scratch for the boards that changed
+        occupied = (boards[:, :, None] >> np.arange(self.columns)) & 1
+        self.tops[which] = np.where(occupied.any(1), occupied.argmax(1), self.rows)
+
+    def calculate_score(self, which, cleared):
+        """
+        Updates score, lines, and level after a clear
+
+        Parameters
+        ----------
+        which : ndarray
+            indexes of the boards
+        cleared : ndarray
+            number of rows cleared on each board
+
+        Returns
+        -------
+        None
+        """
+        self.lines[which] += cleared
+        self.score[which] += SCORES[cleared] * self.level[which]
+
+        # increase level every 10 lines
+        level_up = which[self.lines[which] / 10 > self.level[which]]
+        self.level[level_up] += 1
+
+    def place(self, rotation, x):
+        """
+        Drops the piece of every running game from above at a rotation and
+        column, then locks it
+
+        Placements that would leave the walls are moved back inside. The path
+        down is not checked, so placements the piece could not reach from the
+        spawn point by moving are allowed.
+
+        Parameters
+        ----------
+        rotation : ndarray
+            rotation for every game, 0 to 3
+        x : ndarray
+            pivot column for every game
+
+        Returns
+        -------
+        cleared : ndarray
+            number of rows cleared on every board
+        """
+        running = ~self.game_over
+        shape = self.shape
+        rotation = np.where(shape == O_SHAPE, 0, np.asarray(rotation) % 4)
+        x = np.asarray(x).clip(-LEFT_EDGE[shape, rotation],
+                               self.columns - 1 - RIGHT_EDGE[shape, rotation])
+
+        self.rotation = np.where(running, rotation, self.rotation)
+        self.x = np.where(running, x, self.x)
+        self.y = np.where(running, self.drop_rows(shape, rotation, x), self.y)
+        which = np.flatnonzero(running)
+
+        cleared = np.zeros(self.num_boards, np.int64)
+        cleared[which] = self.lock(which)
+        return cleared
+
+    def step(self, actions):
+        """
+        Applies one action to every running game
+
+        Parameters
+        ----------
+        actions : ndarray
+            NOOP, LEFT, RIGHT, ROTATE, DOWN, or DROP for every game
+
+        Returns
+        -------
+        cleared : ndarray
+            number of rows cleared on every board
+        """
+        actions = np.asarray(actions)
+        running = ~self.game_over
+        shape, rotation, x, y = self.shape, self.rotation, self.x, self.y
+
+        # sideways
+        dx = (actions == RIGHT).astype(np.int64) - (actions == LEFT)
+        moving = running & (dx != 0)
+        moved = moving & ~self.collides(shape, rotation, x + dx, y)
+        self.x = np.where(moved, x + dx, x)
+
+        # rotation
+        new_rotation = (rotation + 1) % 4
+        turning = running & (actions == ROTATE) & (shape != O_SHAPE)
+        turned = turning & ~self.collides(shape, new_rotation, self.x, y)
+        self.rotation = np.where(turned, new_rotation, rotation)
+
+        # hard drop, one row at a time so tucked pieces stay tucked
+        dropping = running & (actions == DROP)
+        while dropping.any():
+            dropping &= ~self.collides(shape, self.rotation, self.x, self.y + 1)
+            self.y = self.y + dropping
+
+        # soft and hard drop, pieces that cannot fall any further lock
+        falling = running & ((actions == DOWN) | (actions == DROP))
+        blocked = falling & self.collides(shape, self.rotation, self.x, self.y + 1)
+        self.y = np.where(falling & ~blocked, self.y + 1, self.y)
+
+        cleared = np.zeros(self.num_boards, np.int64)
+        which = np.flatnonzero(blocked)
+        if len(which):
+            cleared[which] = self.lock(which)
+        return cleared
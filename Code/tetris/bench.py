@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark suite.
+
+Times the hot paths of the game: moving, rotating and dropping a piece, line
+clears of one to four rows on a realistic stack, spawning, and whole frames of
+Game.run, Score.run and Preview.run drawn off screen. Engine benchmarks run on
+both Board and BitBoard. Results are stored as JSON so a run can be compared
+with an earlier one, and any benchmark that got slower than the threshold is
+flagged.
+
+The frame benchmarks import pygame and tetris.app, and load the game's fonts
+and images, which are found from any folder. From the repository root:
+
+    PYTHONPATH=Code python -m tetris.bench --out before.json
+    PYTHONPATH=Code python -m tetris.bench --compare before.json
+"""
+
+from random import Random
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from .bitboard import BitBoard
+from .engine import Board, Engine
+from .randomizer import ShapeQueue, make_randomizer
+from .settings import columns, rows, preview_depth
+
+BOARDS = {
+    'board': Board,
+    'bitboard': BitBoard
+}
+
+def fill_board(board, cleared = 0, height = 12, seed = 0):
+    """
+    Fills a board like a game in progress
+
+    The bottom rows are full, and the rows above them up to height each have
+    one or two holes, so nothing else clears.
+
+    Parameters
+    ----------
+    board : Board or BitBoard object
+        empty board to fill
+    cleared : int
+        number of full rows at the bottom
+    height : int
+        number of rows with blocks
+    seed : int
+        seed of the random holes and shapes
+
+    Returns
+    -------
+    board : Board or BitBoard object
+    """
+    rng = Random(seed)
+    shapes = 'TOJLISZ'
+    for y in range(board.rows - height, board.rows):
+        gaps = set() if y >= board.rows - cleared else set(
+            rng.sample(range(board.columns), rng.randint(1, 2)))
+        for x in range(board.columns):
+            if x not in gaps:
+                board.place([(x, y)], rng.choice(shapes))
+
+    return board
+
+def make_engine(board_class, first_shape = 'T'):
+    """
+    Creates an engine on a filled board with a seeded shape queue
+
+    Parameters
+    ----------
+    board_class : class
+        Board or BitBoard
+    first_shape : str
+        letter of the first piece
+
+    Returns
+    -------
+    Engine object
+    """
+    shape_queue = ShapeQueue(make_randomizer('bag', 0), preview_depth)
+    return Engine(shape_queue.get_next_shape, board = fill_board(board_class()),
+                  first_shape = first_shape)
+
+def measure(op, setup = None, number = 1000, repeat = 5):
+    """
+    Times an operation
+
+    Without setup the operation is called number times in a loop. With setup,
+    setup runs untimed before every call and each call is timed on its own.
+
+    Parameters
+    ----------
+    op : function
+        operation to time
+    setup : function
+        prepares the state for one call, None if op can run back to back
+    number : int
+        calls per repeat
+    repeat : int
+        number of repeats
+
+    Returns
+    -------
+    dict
+        ns_per_op (mean of the fastest repeat), median_ns (median of the
+        repeats), number, and repeat
+    """
+    timer = time.perf_counter
+    times = []
+    for i in range(repeat):
+        if setup is None:
+            start = timer()
+            for call in range(number):
+                op()
+            total = timer() - start
+
+        else:
+            total = 0.0
+            for call in range(number):
+                setup()
+                start = timer()
+                op()
+                total += timer() - start
+
+        times.append(total / number * 1e9)
+
+    times.sort()
+    return {'ns_per_op': times[0], 'median_ns': times[len(times) // 2],
+            'number': number, 'repeat': repeat}
+
+def engine_benchmarks(board_name, board_class):
+    """
+    Yields the engine benchmarks for one kind of board
+
+    Parameters
+    ----------
+    board_name : str
+        name of the board in the results
+    board_class : class
+        Board or BitBoard
+
+    Returns
+    -------
+    generator of tuple
+        name, op, setup, and number of every benchmark
+    """
+    engine = make_engine(board_class)
+    piece = engine.piece
+    spawn_y = engine.spawn_offset[1]
+
+    def move_horizontal():
+        engine.move_horizontal(-1)
+        engine.move_horizontal(1)
+
+    def move_down_setup():
+        piece.y = spawn_y
+
+    def spawn_setup():
+        # a piece inside the field, so the game goes on
+        engine.piece.y = 2
+
+    yield 'engine.move_horizontal[{}]'.format(board_name), move_horizontal, None, 20000
+    yield 'engine.rotate[{}]'.format(board_name), engine.rotate, None, 20000
+    yield 'engine.move_down[{}]'.format(board_name), engine.move_down, move_down_setup, 20000
+    yield 'engine.spawn[{}]'.format(board_name), engine.create_new_tetromino, spawn_setup, 20000
+
+    # dropping onto the stack locks the piece, clears nothing, and spawns
+    drop = {}
+
+    def drop_setup():
+        drop['engine'] = make_engine(board_class)
+
+    yield 'engine.drop_lock[{}]'.format(board_name), lambda: drop['engine'].drop(), drop_setup, 500
+
+    for cleared in range(1, 5):
+        board = {}
+
+        def clear_setup(cleared = cleared):
+            board['board'] = fill_board(board_class(), cleared)
+
+        yield ('board.check_row[{}-{}]'.format(board_name, cleared),
+               lambda: board['board'].check_row(), clear_setup, 500)
+
+def frame_benchmarks():
+    """
+    Yields whole frame benchmarks drawn to an off-screen display
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    -------
+    generator of tuple
+        name, op, setup, and number of every benchmark
+    """
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    from .app import Game, Score, Preview
+    from .settings import window_width, window_height
+
+    pygame.init()
+    pygame.display.set_mode((window_width, window_height))
+
+    shape_queue = ShapeQueue(make_randomizer('bag', 0), preview_depth)
+    game = Game(shape_queue.get_next_shape, None)
+    fill_board(game.engine.board)
+    score = Score()
+    preview = Preview()
+    next_shapes = shape_queue.next_shapes
+
+    def game_setup():
+        # no simulation steps are due, only the drawing is timed
+        game.last_ticks = pygame.time.get_ticks()
+
+    def game_full_setup():
+        game_setup()
+        game.force_redraw()
+
+    direction = [1]
+
+    def game_move_setup():
+        game_setup()
+        direction[0] = -direction[0]
+        game.engine.move_horizontal(direction[0])
+
+    yield 'frame.game_run_full', game.run, game_full_setup, 300
+    yield 'frame.game_run_moved', game.run, game_move_setup, 300
+    yield 'frame.score_run_full', score.run, score.force_redraw, 300
+    yield 'frame.preview_run_full', lambda: preview.run(next_shapes), preview.force_redraw, 300
+    yield 'frame.display_update', pygame.display.update, None, 300
+
+def run_benchmarks(frames = True, select = None, repeat = 5, scale = 1.0):
+    """
+    Runs the suite
+
+    Parameters
+    ----------
+    frames : bool
+        include the pygame frame benchmarks
+    select : str
+        only run benchmarks whose name contains this, all if None
+    repeat : int
+        repeats of every benchmark
+    scale : float
+        multiplies the number of calls of every benchmark
+
+    Returns
+    -------
+    dict
+        meta data and the result of every benchmark by name
+    """
+    groups = [engine_benchmarks(name, board_class) for name, board_class in BOARDS.items()]
+    if frames:
+        groups.append(frame_benchmarks())
+
+    results = {}
+    for group in groups:
+        for name, op, setup, number in group:
+            if select and select not in name:
+                continue
+            results[name] = measure(op, setup, max(int(number * scale), 1), repeat)
+
+    meta = {
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'columns': columns,
+        'rows': rows
+    }
+    return {'meta': meta, 'results': results}
+
+def compare(old, new, threshold = 0.1):
+    """
+    Compares two runs benchmark by benchmark
+
+    Parameters
+    ----------
+    old : dict
+        earlier run, as returned by run_benchmarks
+    new : dict
+        later run
+    threshold : float
+        slowdown that counts as a regression, 0.1 is 10% slower
+
+    Returns
+    -------
+    list
+        (name, old ns, new ns, new / old, regressed) for every benchmark in
+        both runs
+    """
+    rows = []
+    for name, result in new['results'].items():
+        if name not in old['results']:
+            continue
+
+        before = old['results'][name]['ns_per_op']
+        after = result['ns_per_op']
+        ratio = after / before if before else float('inf')
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+
+    return rows
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Time the hot paths of the game")
+    parser.add_argument('--out', help = "JSON file to write the results to")
+    parser.add_argument('--compare', help = "JSON file of an earlier run to compare with")
+    parser.add_argument('--threshold', type = float, default = 0.1,
+                        help = "slowdown flagged as a regression, 0.1 is 10%% slower")
+    parser.add_argument('--no-frames', action = 'store_true',
+                        help = "skip the pygame frame benchmarks")
+    parser.add_argument('--select', help = "only run benchmarks whose name contains this")
+    parser.add_argument('--repeat', type = int, default = 5)
+    parser.add_argument('--scale', type = float, default = 1.0,
+                        help = "multiplies the number of calls of every benchmark")
+    args = parser.parse_args()
+
+    run = run_benchmarks(not args.no_frames, args.select, args.repeat, args.scale)
+    if args.out:
+        with open(args.out, 'w') as file:
+            json.dump(run, file, indent = 2)
+
+    if not args.compare:
+        for name, result in run['results'].items():
+            print("{:40} {:12.0f} ns".format(name, result['ns_per_op']))
+        sys.exit()
+
+    with open(args.compare) as file:
+        old = json.load(file)
+
+    regressions = 0
+    for name, before, after, ratio, regressed in compare(old, run, args.threshold):
+        regressions += regressed
+        print("{:40} {:12.0f} {:12.0f} ns {:7.2f}x{}".format(
+            name, before, after, ratio, "  REGRESSION" if regressed else ""))
+
+    sys.exit(1 if regressions else 0)
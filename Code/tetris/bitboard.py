@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+
+"""
+Bitboard playing field.
+
+An alternative to engine.Board that packs the whole field into one integer,
+bit (y + TOP_ROWS) * columns + x set when the cell in column x of row y is
+occupied. Every orientation of every shape is packed the same way once for
+every column, so a whole piece is tested for collision with one shift and one
+AND, and a clear is a few shifts of the packed field. The row and column
+counters are kept by engine.BaseBoard like for any board. The shape of every
+cell is kept in one flat bytearray, with a view per row, so the field can
+still be drawn and a clear moves the rows above it in a single copy.
+"""
+
+from .settings import columns, rows, tetromino_dict
+from .rotations import FOOTPRINTS
+from .engine import BaseBoard
+
+# compact codes for the shapes, 0 is an empty cell
+SHAPE_CODES = {shape: code for code, shape in enumerate(tetromino_dict, 1)}
+SHAPE_NAMES = [0] + list(tetromino_dict)
+
+# empty rows kept above the field in the packed bits, so a piece that sticks
+# out of the top, as every piece does when it spawns, is tested with one shift
+TOP_ROWS = 4
+
+def pack_placements(columns):
+    """
+    Packs the footprint of every orientation of every shape at every column
+    of a field width
+
+    Parameters
+    ----------
+    columns : int
+        width of the field in cells
+
+    Returns
+    -------
+    dict
+        shape -> four orientations of a list indexed by x + columns, for x
+        from -columns to 2 * columns - 1, of (bits, shift, bottom): the rows
+        of the footprint one field width apart and moved to column x, the
+        shift of its top row at y = 0, and its lowest y offset; None where
+        the footprint is outside the side walls
+    """
+    placements = {}
+    for shape, footprints in FOOTPRINTS.items():
+        orientations = []
+        for left, right, top, masks in footprints:
+            bits = 0
+            for row, mask in enumerate(masks):
+                bits |= mask << row * columns
+            bottom = top + len(masks) - 1
+            orientations.append([
+                (bits << x + left, (top + TOP_ROWS) * columns, bottom)
+                if 0 <= x + left and x + right < columns else None
+                for x in range(-columns, 2 * columns)])
+        placements[shape] = tuple(orientations)
+
+    return placements
+
+class BitBoard(BaseBoard):
+    """
+    A class to represent the playing field as one packed bitmask.
+
+    ...
+
+    Attributes
+    ----------
+    columns : int
+        width of the field in cells
+    rows : int
+        height of the field in cells
+    field_bits : int
+        occupied cells of the whole field, TOP_ROWS empty rows first
+    placements : dict
+        packed footprint of every orientation of every shape at every column
+    above_bits : list
+        mask of the packed bits above every row
+    below_bits : list
+        mask of the packed bits below every row
+    empty_row : bytes
+        shape codes of an empty row
+    cells : bytearray
+        shape code of every cell, row after row
+    flat : memoryview
+        writable view of all of cells, used to move rows
+    field_data : list
+        view of the shape codes of every row
+    row_counts : list
+        number of occupied cells in every row
+    column_heights : list
+        height of the highest block of every column, 0 if empty
+    column_holes : list
+        number of empty cells below the highest block of every column
+
+    Methods
+    -------
+    def row_masks():
+        returns the occupied cells of every row as a bitmask
+
+    def collides(cells):
+        checks if any cell is outside the field or occupied
+
+    def collides_at(shape, rotation, x, y):
+        checks the packed footprint of a shape against the field
+
+    def set_cell(x, y, shape):
+        stores a block of a shape in a cell
+
+    def remove_rows(delete_rows):
+        removes full rows and moves the rows above them down
+
+    def shape_at(x, y):
+        returns the shape letter of a cell
+
+    def clear():
+        empties the field
+    """
+    def __init__(self, columns = columns, rows = rows):
+        """
+        Constructs all necessary attributes for the BitBoard class
+
+        Parameters
+        ----------
+        columns : int
+            width of the field in cells
+        rows : int
+            height of the field in cells
+        """
+        super().__init__(columns, rows)
+        self.field_bits = 0
+        self.placements = pack_placements(columns)
+        self.above_bits = [(1 << (y + TOP_ROWS) * columns) - 1 for y in range(rows)]
+        field_mask = (1 << (rows + TOP_ROWS) * columns) - 1
+        self.below_bits = [field_mask ^ (1 << (y + TOP_ROWS + 1) * columns) - 1
+                           for y in range(rows)]
+        self.empty_row = bytes(columns)
+        self.cells = bytearray(rows * columns)
+        self.flat = memoryview(self.cells)
+        self.field_data = [self.flat[y * columns:(y + 1) * columns] for y in range(rows)]
+
+    @property
+    def row_masks(self):
+        """
+        Returns the occupied cells of every row as a bitmask, unpacked from
+        the field
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        list
+        """
+        columns = self.columns
+        full_mask = (1 << columns) - 1
+        bits = self.field_bits >> TOP_ROWS * columns
+        return [bits >> y * columns & full_mask for y in range(self.rows)]
+
+    def collides(self, cells):
+        """
+        Checks if any cell is outside the field or on an occupied cell
+
+        Parameters
+        ----------
+        cells : list
+            (x, y) positions to check
+
+        Returns
+        -------
+        bool
+        """
+        columns = self.columns
+        bits = self.field_bits
+        for x, y in cells:
+            if not 0 <= x < columns or y >= self.rows:
+                return True
+
+            if y >= 0 and bits >> (y + TOP_ROWS) * columns + x & 1:
+                return True
+
+        return False
+
+    def collides_at(self, shape, rotation, x, y):
+        """
+        Checks the packed footprint of a shape at a position with one AND
+
+        The footprint is looked up already moved to column x, so the side
+        walls are a None entry and only the floor is compared.
+
+        Parameters
+        ----------
+        shape : str
+            letter of the shape
+        rotation : int
+            orientation of the shape, 0 to 3
+        x : int
+            column of the pivot block, from -columns to 2 * columns - 1
+        y : int
+            row of the pivot block
+
+        Returns
+        -------
+        bool
+        """
+        placement = self.placements[shape][rotation][x + self.columns]
+        if placement is None or y + placement[2] >= self.rows:
+            return True
+
+        shift = placement[1] + y * self.columns
+        # a footprint above the rows kept over the field touches nothing
+        return shift >= 0 and self.field_bits >> shift & placement[0] != 0
+
+    def set_cell(self, x, y, shape):
+        """
+        Stores a block of a shape in a cell inside the field
+
+        Parameters
+        ----------
+        x : int
+            column of the cell
+        y : int
+            row of the cell
+        shape : str
+            letter of the shape
+
+        Returns
+        -------
+        None
+        """
+        self.field_bits |= 1 << (y + TOP_ROWS) * self.columns + x
+        self.field_data[y][x] = SHAPE_CODES[shape]
+
+    def remove_rows(self, delete_rows):
+        """
+        Removes full rows and moves the rows above them down
+
+        Touching full rows, such as the four of a tetris, are removed together
+        with one shift of the packed bits and one copy of the shape codes.
+        Rows kept between full rows split them into runs that are removed one
+        at a time, top down, which leaves the indexes of the runs below as
+        they were.
+
+        Parameters
+        ----------
+        delete_rows : list
+            indexes of the full rows, top down
+
+        Returns
+        -------
+        None
+        """
+        columns = self.columns
+        top = delete_rows[0]
+        bottom = delete_rows[-1]
+        removed = len(delete_rows)
+        if bottom - top >= removed:
+            # rows kept between the full rows, each run of full rows in turn
+            runs = [[top]]
+            for y in delete_rows[1:]:
+                if y == runs[-1][-1] + 1:
+                    runs[-1].append(y)
+                else:
+                    runs.append([y])
+            for run in runs:
+                self.remove_rows(run)
+            return
+
+        bits = self.field_bits
+        self.field_bits = (bits & self.below_bits[bottom]
+                           | (bits & self.above_bits[top]) << removed * columns)
+        flat = self.flat
+        flat[removed * columns:(bottom + 1) * columns] = flat[:top * columns]
+        flat[:removed * columns] = self.empty_row * removed
+
+    def shape_at(self, x, y):
+        """
+        Returns the shape letter of a cell
+
+        Parameters
+        ----------
+        x : int
+            column of the cell
+        y : int
+            row of the cell
+
+        Returns
+        -------
+        str or 0
+        """
+        return SHAPE_NAMES[self.field_data[y][x]]
+
+    def clear(self):
+        """
+        Empties the field, keeping the cells and their row views
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.field_bits = 0
+        self.flat[:] = self.empty_row * self.rows
+        super().clear()
@@ -0,0 +1,837 @@
+# -*- coding: utf-8 -*-
+
+"""
+Headless game engine.
+
+All of the rules of the game (spawning, moving, rotating, collisions, line
+clears, scoring and the level/speed curve) live here. Nothing in this module
+imports pygame, so a game can be stepped without a display or any sprites. The
+pygame classes in tetris/app.py sit on top of the engine and only draw its
+state.
+"""
+
+from abc import ABC, abstractmethod
+
+from .settings import columns, rows, block_offset, start_speed, SCORE_DATA
+from .rotations import ROTATIONS
+from .randomizer import UniformRandomizer
+
+# actions for Engine.act
+NOOP, LEFT, RIGHT, ROTATE, DOWN, DROP = range(6)
+
+class BaseBoard(ABC):
+    """
+    A class to keep the row and column counters shared by every kind of board.
+
+    ...
+
+    The counters are updated here on every lock and clear, so Board, BitBoard
+    and env.ArrayBoard only store their cells: a board keeps one row of cells
+    per row in field_data, nonzero where a block is, and implements the
+    abstract set_cell and remove_rows to store a cell and remove full rows.
+
+    Attributes
+    ----------
+    columns : int
+        width of the field in cells
+    rows : int
+        height of the field in cells
+    field_data : list
+        cells of every row, nonzero where a block is, set by the subclass
+    row_counts : list
+        number of occupied cells in every row
+    column_heights : list
+        height of the highest block of every column, 0 if empty
+    column_holes : list
+        number of empty cells below the highest block of every column
+
+    Methods
+    -------
+    def set_cell(x, y, shape):
+        stores a block of a shape in a cell
+
+    def remove_rows(delete_rows):
+        removes full rows and moves the rows above them down
+
+    def place(cells, shape):
+        stores cells of a shape in the field
+
+    def check_row(rows):
+        clears full rows and returns their indexes
+
+    def lower_columns(delete_rows):
+        updates the column counters for removed rows
+
+    def drop_distance(cells):
+        returns how far cells can fall straight down
+
+    def clear():
+        empties the counters
+    """
+    def __init__(self, columns = columns, rows = rows):
+        """
+        Constructs all necessary attributes for the BaseBoard class
+
+        Parameters
+        ----------
+        columns : int
+            width of the field in cells
+        rows : int
+            height of the field in cells
+        """
+        self.columns = columns
+        self.rows = rows
+        self.row_counts = [0] * rows
+        self.column_heights = [0] * columns
+        self.column_holes = [0] * columns
+
+    @abstractmethod
+    def set_cell(self, x, y, shape):
+        """
+        Stores a block of a shape in a cell inside the field
+
+        Parameters
+        ----------
+        x : int
+            column of the cell
+        y : int
+            row of the cell
+        shape : str
+            letter of the shape
+
+        Returns
+        -------
+        None
+        """
+
+    @abstractmethod
+    def remove_rows(self, delete_rows):
+        """
+        Removes the cells of full rows, moves the rows above them down, and
+        empties the rows freed at the top
+
+        Parameters
+        ----------
+        delete_rows : list
+            indexes of the full rows, top down
+
+        Returns
+        -------
+        None
+        """
+
+    def place(self, cells, shape):
+        """
+        Stores the cells of a locked shape in the field and updates the row
+        and column counters
+
+        Parameters
+        ----------
+        cells : list
+            (x, y) positions of the shape
+        shape : str
+            letter of the shape
+
+        Returns
+        -------
+        None
+        """
+        counts = self.row_counts
+        heights = self.column_heights
+        holes = self.column_holes
+        for x, y in cells:
+            if y >= 0:
+                if not self.field_data[y][x]:
+                    counts[y] += 1
+                    height = self.rows - y
+                    if height > heights[x]:
+                        # the cells skipped over become holes
+                        holes[x] += height - heights[x] - 1
+                        heights[x] = height
+                    else:
+                        holes[x] -= 1
+                self.set_cell(x, y, shape)
+
+    def check_row(self, rows = None):
+        """
+        Clears full rows and moves the rows above them down in place
+
+        A row is full when its count reaches the width, so only the rows that
+        can have changed need to be looked at. Rows are removed top down, so
+        removing one leaves the indexes of the rows below it as they were, and
+        rows below the lowest full row are never touched. The column counters
+        are updated once for all of them.
+
+        Parameters
+        ----------
+        rows : iterable
+            indexes of the rows to check, such as the rows of the piece that
+            just locked, every row if None
+
+        Returns
+        -------
+        delete_rows : list
+            indexes of the rows that were cleared, top down
+        """
+        columns = self.columns
+        counts = self.row_counts
+        if rows is None:
+            delete_rows = [y for y, count in enumerate(counts) if count == columns]
+        else:
+            delete_rows = sorted(y for y in rows if counts[y] == columns)
+
+        if delete_rows:
+            self.remove_rows(delete_rows)
+            for y in delete_rows:
+                del counts[y]
+                counts.insert(0, 0)
+            self.lower_columns(delete_rows)
+
+        return delete_rows
+
+    def lower_columns(self, delete_rows):
+        """
+        Updates the column counters once after full rows were removed and the
+        rows above them moved down
+
+        Every column has a block in every full row, so its highest block is
+        either above the highest full row, and the column only gets lower by
+        the number of rows removed, or in that row. Only the second kind is
+        looked at again: it falls to its next block below the removed rows,
+        and the holes passed on the way stop being holes. When no column tops
+        out in that row, which is most clears, all heights drop in one pass.
+
+        Parameters
+        ----------
+        delete_rows : list
+            indexes of the removed rows, top down
+
+        Returns
+        -------
+        None
+        """
+        rows = self.rows
+        heights = self.column_heights
+        removed = len(delete_rows)
+        top = rows - delete_rows[0]
+        if top not in heights:
+            heights[:] = [height - removed for height in heights]
+            return
+
+        field_data = self.field_data
+        holes = self.column_holes
+        # the rows above the highest full row now end just above this one
+        start = delete_rows[0] + removed
+        for x in range(self.columns):
+            if heights[x] > top:
+                heights[x] -= removed
+                continue
+
+            below = start
+            while below < rows and not field_data[below][x]:
+                below += 1
+
+            holes[x] -= below - start
+            heights[x] = rows - below
+
+    def drop_distance(self, cells):
+        """
+        Returns how far cells can fall straight down, from the column heights
+
+        Parameters
+        ----------
+        cells : list
+            (x, y) positions of a piece
+
+        Returns
+        -------
+        int or None
+            rows the cells can fall, None if a cell is below the highest
+            block of its column, where the heights cannot tell
+        """
+        top = self.rows
+        heights = self.column_heights
+        distance = top
+        for x, y in cells:
+            free = top - heights[x] - 1 - y
+            if free < distance:
+                if free < 0:
+                    return None
+                distance = free
+
+        return distance
+
+    def clear(self):
+        """
+        Sets the row and column counters back to an empty field
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.row_counts[:] = [0] * self.rows
+        self.column_heights[:] = [0] * self.columns
+        self.column_holes[:] = [0] * self.columns
+
+class Board(BaseBoard):
+    """
+    A class to represent the playing field.
+
+    ...
+
+    Attributes
+    ----------
+    columns : int
+        width of the field in cells
+    rows : int
+        height of the field in cells
+    field_data : list
+        rows x columns grid holding a shape letter or 0 for every cell
+    row_counts : list
+        number of occupied cells in every row
+    column_heights : list
+        height of the highest block of every column, 0 if empty
+    column_holes : list
+        number of empty cells below the highest block of every column
+
+    Methods
+    -------
+    def collides(cells):
+        checks if any cell is outside the field or occupied
+
+    def collides_at(shape, rotation, x, y):
+        checks a shape at a position against the field
+
+    def set_cell(x, y, shape):
+        stores a block of a shape in a cell
+
+    def remove_rows(delete_rows):
+        removes full rows and moves the rows above them down
+
+    def shape_at(x, y):
+        returns the shape letter of a cell
+
+    def clear():
+        empties the field
+    """
+    def __init__(self, columns = columns, rows = rows):
+        """
+        Constructs all necessary attributes for the Board class
+
+        Parameters
+        ----------
+        columns : int
+            width of the field in cells
+        rows : int
+            height of the field in cells
+        """
+        super().__init__(columns, rows)
+        self.field_data = [[0 for x in range(columns)] for y in range(rows)]
+
+    def collides(self, cells):
+        """
+        Checks if any cell is outside the field or on an occupied cell
+
+        Parameters
+        ----------
+        cells : list
+            (x, y) positions to check
+
+        Returns
+        -------
+        bool
+        """
+        for x, y in cells:
+            if not 0 <= x < self.columns or y >= self.rows:
+                return True
+
+            if y >= 0 and self.field_data[y][x]:
+                return True
+
+        return False
+
+    def collides_at(self, shape, rotation, x, y):
+        """
+        Checks if a shape at a position is outside the field or occupied
+
+        Parameters
+        ----------
+        shape : str
+            letter of the shape
+        rotation : int
+            orientation of the shape, 0 to 3
+        x : int
+            column of the pivot block
+        y : int
+            row of the pivot block
+
+        Returns
+        -------
+        bool
+        """
+        return self.collides([(x + dx, y + dy) for dx, dy in ROTATIONS[shape][rotation]])
+
+    def set_cell(self, x, y, shape):
+        """
+        Stores a block of a shape in a cell inside the field
+
+        Parameters
+        ----------
+        x : int
+            column of the cell
+        y : int
+            row of the cell
+        shape : str
+            letter of the shape
+
+        Returns
+        -------
+        None
+        """
+        self.field_data[y][x] = shape
+
+    def remove_rows(self, delete_rows):
+        """
+        Empties every full row and moves it to the top, which moves the rows
+        above it down; going top down leaves the indexes of the rows below as
+        they were, and the field_data list object is kept so references to it
+        stay valid
+
+        Parameters
+        ----------
+        delete_rows : list
+            indexes of the full rows, top down
+
+        Returns
+        -------
+        None
+        """
+        field_data = self.field_data
+        for y in delete_rows:
+            row = field_data.pop(y)
+            row[:] = [0] * self.columns
+            field_data.insert(0, row)
+
+    def shape_at(self, x, y):
+        """
+        Returns the shape letter of a cell
+
+        Parameters
+        ----------
+        x : int
+            column of the cell
+        y : int
+            row of the cell
+
+        Returns
+        -------
+        str or 0
+        """
+        return self.field_data[y][x]
+
+    def clear(self):
+        """
+        Empties the field, keeping the row lists
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        for row in self.field_data:
+            row[:] = [0] * self.columns
+        super().clear()
+
+class Piece:
+    """
+    A class to represent the falling piece.
+
+    ...
+
+    Attributes
+    ----------
+    shape : str
+        letter of the shape in tetromino_dict
+    rotation : int
+        orientation of the shape in ROTATIONS, 0 to 3
+    x : int
+        column of the pivot block
+    y : int
+        row of the pivot block
+    cells : list
+        (x, y) field positions of the four blocks, pivot first
+
+    Methods
+    -------
+    None
+    """
+    def __init__(self, shape, offset = block_offset):
+        """
+        Constructs all necessary attributes for the Piece class
+
+        Parameters
+        ----------
+        shape : str
+            letter of the shape in tetromino_dict
+        offset : tuple
+            spawn position of the pivot block
+        """
+        self.shape = shape
+        self.rotation = 0
+        self.x, self.y = offset
+
+    @property
+    def cells(self):
+        """
+        Field positions of the four blocks, pivot first
+
+        Returns
+        -------
+        list
+        """
+        x, y = self.x, self.y
+        return [(x + dx, y + dy) for dx, dy in ROTATIONS[self.shape][self.rotation]]
+
+class Engine:
+    """
+    A class to run the rules of the game without pygame.
+
+    ...
+
+    Attributes
+    ----------
+    board : Board object
+        the playing field
+    field_data : list
+        grid of the board, shared with the renderer
+    get_next_shape : function
+        returns the letter of the next shape
+    update_score : function
+        called with lines, score, and level after a line clear
+    spawn_offset : tuple
+        spawn position of the pivot block, block_offset moved to the middle
+        of a board of another width
+    piece : Piece object
+        the falling piece
+    down_speed : float
+        time between automatic moves down in ms
+    press_speed : float
+        time between moves down while the down key is held in ms
+    current_level : int
+        the current level
+    current_score : int
+        the current score
+    current_lines : int
+        the current lines cleared
+    pieces_placed : int
+        number of pieces locked so far
+    cleared_rows : list
+        indexes of the rows cleared by the last piece locked, top down
+    game_over : bool
+        set once a piece locks above the field
+
+    Methods
+    -------
+    def calculate_score(num_lines):
+        calculates the current user score and updates attributes
+
+    def check_game_over():
+        checks if the user has lost
+
+    def create_new_tetromino():
+        clears rows, checks for loss, and spawns the next piece
+
+    def move_horizontal(amount):
+        moves the piece sideways
+
+    def move_down():
+        moves the piece down or locks it
+
+    def rotate():
+        rotates the piece
+
+    def drop():
+        moves the piece down until it locks
+
+    def act(action):
+        applies one action
+
+    def new_game(first_shape, speed):
+        spawns the first piece and resets speed and score
+
+    def reset(get_next_shape, first_shape, speed):
+        starts a new game on the same board
+    """
+    def __init__(self, get_next_shape = None, update_score = None,
+                 board = None, first_shape = None):
+        """
+        Constructs all necessary attributes for the Engine class
+
+        Parameters
+        ----------
+        get_next_shape : function
+            returns the letter of the next shape, random if None
+        update_score : function
+            called with lines, score, and level after a line clear
+        board : Board object
+            the playing field, a new empty Board if None
+        first_shape : str
+            letter of the first piece, taken from get_next_shape if None
+        """
+        self.board = board if board is not None else Board()
+        self.field_data = self.board.field_data
+        self.get_next_shape = get_next_shape or UniformRandomizer().next_shape
+        self.update_score = update_score
+        self.spawn_offset = (block_offset[0] + (self.board.columns - columns) // 2,
+                             block_offset[1])
+        self.new_game(first_shape)
+
+    def new_game(self, first_shape = None, speed = start_speed):
+        """
+        Spawns the first piece and sets speed and score back to the start
+
+        Parameters
+        ----------
+        first_shape : str
+            letter of the first piece, taken from get_next_shape if None
+        speed : float
+            time between automatic moves down in ms at level 1
+
+        Returns
+        -------
+        None
+        """
+        # piece
+        self.piece = Piece(first_shape or self.get_next_shape(), self.spawn_offset)
+
+        # speed
+        self.down_speed = speed
+        self.press_speed = self.down_speed * 0.3
+
+        # score
+        self.current_level = 1
+        self.current_score = 0
+        self.current_lines = 0
+        self.pieces_placed = 0
+        self.cleared_rows = []
+        self.game_over = False
+
+    def reset(self, get_next_shape = None, first_shape = None, speed = start_speed):
+        """
+        Empties the board and starts a new game on it
+
+        Parameters
+        ----------
+        get_next_shape : function
+            returns the letter of the next shape, the one from before if None
+        first_shape : str
+            letter of the first piece, taken from get_next_shape if None
+        speed : float
+            time between automatic moves down in ms at level 1
+
+        Returns
+        -------
+        None
+        """
+        if get_next_shape:
+            self.get_next_shape = get_next_shape
+
+        self.board.clear()
+        self.new_game(first_shape, speed)
+
+    def calculate_score(self, num_lines):
+        """
+        Updates the user score, lines, and level
+
+        Parameters
+        ----------
+        num_lines : int
+            Number of lines cleared
+
+        Returns
+        -------
+        None
+        """
+        self.current_lines += num_lines
+        self.current_score += SCORE_DATA[num_lines] * self.current_level
+
+        # increase level every 10 lines
+        if self.current_lines / 10 > self.current_level:
+            self.current_level += 1
+            self.down_speed *= 0.75
+            self.press_speed = self.down_speed * 0.3
+
+        if self.update_score:
+            self.update_score(self.current_lines, self.current_score,
+                              self.current_level)
+
+    def check_game_over(self):
+        """
+        Checks if the piece locked above the field
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bool
+        """
+        if any(y < 0 for x, y in self.piece.cells):
+            self.game_over = True
+
+        return self.game_over
+
+    def create_new_tetromino(self):
+        """
+        Clears rows, checks for loss, and spawns the next piece
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        # only the rows of the piece that just locked can have filled up
+        delete_rows = self.board.check_row({y for x, y in self.piece.cells if y >= 0})
+        self.cleared_rows = delete_rows
+        if delete_rows:
+            self.calculate_score(len(delete_rows))
+
+        if not self.check_game_over():
+            self.piece = Piece(self.get_next_shape(), self.spawn_offset)
+
+    def move_horizontal(self, amount):
+        """
+        Moves the piece horizontally if valid position
+
+        Parameters
+        ----------
+        amount : int
+            how far to move the piece
+
+        Returns
+        -------
+        bool
+            True if the piece moved
+        """
+        piece = self.piece
+        if self.game_over or self.board.collides_at(
+                piece.shape, piece.rotation, piece.x + amount, piece.y):
+            return False
+
+        piece.x += amount
+        return True
+
+    def move_down(self):
+        """
+        Moves the piece down, or locks it if it cannot move
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bool
+            True if the piece moved, False if it was locked
+        """
+        if self.game_over:
+            return False
+
+        piece = self.piece
+        if not self.board.collides_at(piece.shape, piece.rotation, piece.x, piece.y + 1):
+            piece.y += 1
+            return True
+
+        self.board.place(piece.cells, piece.shape)
+        self.pieces_placed += 1
+        self.create_new_tetromino()
+        return False
+
+    def rotate(self):
+        """
+        Rotates the piece if valid position
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bool
+            True if the piece rotated
+        """
+        if self.game_over or self.piece.shape == 'O':
+            return False
+
+        piece = self.piece
+        rotation = (piece.rotation + 1) % 4
+        if self.board.collides_at(piece.shape, rotation, piece.x, piece.y):
+            return False
+
+        piece.rotation = rotation
+        return True
+
+    def drop(self):
+        """
+        Moves the piece down until it locks
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        rows : int
+            number of rows the piece fell
+        """
+        if self.game_over:
+            return 0
+
+        # above the stack the column heights give the distance at once, a
+        # piece tucked under an overhang falls a row at a time
+        rows = self.board.drop_distance(self.piece.cells)
+        if rows is None:
+            rows = 0
+            while self.move_down():
+                rows += 1
+
+            return rows
+
+        self.piece.y += rows
+        self.move_down()
+        return rows
+
+    def act(self, action):
+        """
+        Applies one action to the piece
+
+        Parameters
+        ----------
+        action : int
+            NOOP, LEFT, RIGHT, ROTATE, DOWN, or DROP
+
+        Returns
+        -------
+        None
+        """
+        if action == LEFT:
+            self.move_horizontal(-1)
+        elif action == RIGHT:
+            self.move_horizontal(1)
+        elif action == ROTATE:
+            self.rotate()
+        elif action == DOWN:
+            self.move_down()
+        elif action == DROP:
+            self.drop()
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+
+"""
+Reinforcement learning environment.
+
+TetrisEnv wraps the engine in the reset/step interface of gym: every step
+applies one action straight to the engine, with no timers or frames, and
+returns the board, the points scored and whether the game is over. The board
+is an ArrayBoard whose cells live in one NumPy array, so the observation is a
+read-only view of the engine's own field rather than a copy. VectorTetrisEnv
+steps many environments whose boards share one array, and restarts them as
+their games end.
+
+Rendering is optional and uses the pygame Game class from tetris.app, which is
+only imported the first time render() is called.
+"""
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("tetris.env needs numpy, install it with "
+                      "'pip install numpy'") from error
+
+from .bitboard import BitBoard, SHAPE_CODES
+from .engine import Engine, NOOP, LEFT, RIGHT, ROTATE, DOWN, DROP
+from .randomizer import ShapeQueue, make_randomizer
+from .settings import columns, rows, randomizer, preview_depth
+
+ACTIONS = (NOOP, LEFT, RIGHT, ROTATE, DOWN, DROP)
+
+class ArrayBoard(BitBoard):
+    """
+    A class to represent a bitboard field whose cells live in a NumPy array.
+
+    ...
+
+    Attributes
+    ----------
+    columns : int
+        width of the field in cells
+    rows : int
+        height of the field in cells
+    field_bits : int
+        occupied cells of the whole field, packed
+    placements : dict
+        packed footprint of every orientation of every shape at every column
+    row_counts : list
+        number of occupied cells in every row
+    column_heights : list
+        height of the highest block of every column, 0 if empty
+    column_holes : list
+        number of empty cells below the highest block of every column
+    cells : ndarray
+        rows x columns shape codes, 0 for empty cells
+    flat : memoryview
+        writable view of all of cells, used by BitBoard to move rows
+    field_data : list
+        views of the rows of cells
+    """
+    def __init__(self, columns = columns, rows = rows, cells = None):
+        """
+        Constructs all necessary attributes for the ArrayBoard class
+
+        Parameters
+        ----------
+        columns : int
+            width of the field in cells
+        rows : int
+            height of the field in cells
+        cells : ndarray
+            rows x columns uint8 array to keep the cells in, a new one if None
+        """
+        super().__init__(columns, rows)
+        self.cells = cells if cells is not None else np.zeros((rows, columns), np.uint8)
+        self.cells[:] = 0
+        self.flat = memoryview(self.cells.reshape(-1))
+        self.field_data = list(self.cells)
+
+class TetrisEnv:
+    """
+    A class to play the engine one action at a time.
+
+    ...
+
+    Attributes
+    ----------
+    kind : str
+        name of the randomizer
+    seed : int
+        seed of the randomizer, random if None
+    randomizer : randomizer object
+        deals the shapes of every game
+    gravity : int
+        steps between automatic moves down, None for no gravity
+    render_mode : str
+        None, 'human' to draw in a window, or 'rgb_array' to return frames
+    board : ArrayBoard object
+        the playing field, kept across games
+    observation : ndarray
+        read-only view of the cells of the board
+    shape_queue : ShapeQueue object
+        upcoming shapes
+    engine : Engine object
+        engine that runs the rules, kept across games
+    steps : int
+        steps taken in the current game
+    game : Game object
+        pygame view used for rendering, None until the first render
+
+    Methods
+    -------
+    def reset(seed):
+        starts a new game
+
+    def step(action):
+        applies one action
+
+    def get_info():
+        returns the state that is not in the observation
+
+    def render():
+        draws the game
+
+    def close():
+        closes the window
+    """
+    def __init__(self, kind = randomizer, seed = None, gravity = None,
+                 render_mode = None, cells = None):
+        """
+        Constructs all necessary attributes for the TetrisEnv class
+
+        Parameters
+        ----------
+        kind : str
+            name of the randomizer
+        seed : int
+            seed of the randomizer, random if None
+        gravity : int
+            steps between automatic moves down, None for no gravity
+        render_mode : str
+            None, 'human' to draw in a window, or 'rgb_array' to return frames
+        cells : ndarray
+            rows x columns uint8 array to keep the board in, a new one if None
+        """
+        if render_mode not in (None, 'human', 'rgb_array'):
+            raise ValueError("unknown render mode {!r}".format(render_mode))
+
+        self.kind = kind
+        self.seed = seed
+        self.randomizer = make_randomizer(kind, seed)
+        self.gravity = gravity
+        self.render_mode = render_mode
+
+        self.board = ArrayBoard(cells = cells)
+        self.observation = self.board.cells.view()
+        self.observation.flags.writeable = False
+        self.shape_queue = ShapeQueue(self.randomizer, preview_depth)
+        self.engine = Engine(self.shape_queue.get_next_shape, board = self.board)
+        self.steps = 0
+
+        self.game = None
+
+    def reset(self, seed = None):
+        """
+        Starts a new game on the same board
+
+        Parameters
+        ----------
+        seed : int
+            reseeds the randomizer, the shapes carry on from the last game
+            if None
+
+        Returns
+        -------
+        observation : ndarray
+        info : dict
+        """
+        if seed is not None:
+            self.seed = seed
+            self.randomizer = make_randomizer(self.kind, seed)
+
+        self.shape_queue = ShapeQueue(self.randomizer, preview_depth)
+        self.engine.reset(self.shape_queue.get_next_shape)
+        self.steps = 0
+        if self.game is not None:
+            self.game.force_redraw()
+
+        return self.observation, self.get_info()
+
+    def step(self, action):
+        """
+        Applies one action, then gravity if it is due
+
+        Parameters
+        ----------
+        action : int
+            NOOP, LEFT, RIGHT, ROTATE, DOWN, or DROP
+
+        Returns
+        -------
+        observation : ndarray
+            read-only view of the board
+        reward : int
+            points scored by the step
+        done : bool
+            True once the game is over
+        info : dict
+        """
+        engine = self.engine
+        score = engine.current_score
+
+        engine.act(action)
+        self.steps += 1
+        if self.gravity and self.steps % self.gravity == 0 and action != DROP:
+            engine.move_down()
+
+        if self.render_mode == 'human':
+            self.render()
+
+        return (self.observation, engine.current_score - score, engine.game_over,
+                self.get_info())
+
+    def get_info(self):
+        """
+        Returns the state of the game that is not in the observation
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            falling piece, upcoming shapes, score, lines, level, pieces, and
+            the height and holes of every column, from the board's counters
+        """
+        engine = self.engine
+        piece = engine.piece
+        return {
+            'shape': SHAPE_CODES[piece.shape],
+            'rotation': piece.rotation,
+            'x': piece.x,
+            'y': piece.y,
+            'next_shapes': [SHAPE_CODES[shape] for shape in self.shape_queue.next_shapes],
+            'score': engine.current_score,
+            'lines': engine.current_lines,
+            'level': engine.current_level,
+            'pieces_placed': engine.pieces_placed,
+            'column_heights': list(self.board.column_heights),
+            'column_holes': list(self.board.column_holes)
+        }
+
+    def render(self):
+        """
+        Draws the game with the same code the pygame front end uses
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        ndarray or None
+            width x height x 3 frame in 'rgb_array' mode
+        """
+        if self.render_mode is None:
+            return None
+
+        if self.game is None:
+            import pygame
+            from .app import Game
+            from .settings import window_width, window_height
+
+            pygame.init()
+            if pygame.display.get_surface() is None:
+                pygame.display.set_mode((window_width, window_height))
+            self.game = Game(None, None)
+
+        if self.game.engine is not self.engine:
+            self.game.attach(self.engine)
+
+        # the game view quits once the game is over, keep the last frame
+        if not self.engine.game_over:
+            import pygame
+            pygame.display.update(self.game.draw())
+            pygame.event.pump()
+
+        if self.render_mode == 'rgb_array':
+            import pygame
+            return pygame.surfarray.array3d(self.game.surface)
+
+    def close(self):
+        """
+        Closes the window if one was opened
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        if self.game is not None:
+            import pygame
+            pygame.display.quit()
+            self.game = None
+
+class VectorTetrisEnv:
+    """
+    A class to step many environments at once.
+
+    ...
+
+    Attributes
+    ----------
+    cells : ndarray
+        environments x rows x columns, the boards of all environments
+    observations : ndarray
+        read-only view of cells
+    envs : list
+        TetrisEnv object for every board
+
+    Methods
+    -------
+    def reset():
+        starts new games in every environment
+
+    def step(actions):
+        applies one action to every environment
+    """
+    def __init__(self, num_envs, kind = randomizer, seed = None, gravity = None):
+        """
+        Constructs all necessary attributes for the VectorTetrisEnv class
+
+        Parameters
+        ----------
+        num_envs : int
+            number of environments
+        kind : str
+            name of the randomizer
+        seed : int
+            seed of the first environment, the others count up from it,
+            random if None
+        gravity : int
+            steps between automatic moves down, None for no gravity
+        """
+        self.cells = np.zeros((num_envs, rows, columns), np.uint8)
+        self.observations = self.cells.view()
+        self.observations.flags.writeable = False
+        self.envs = [TetrisEnv(kind, None if seed is None else seed + i, gravity,
+                               cells = self.cells[i])
+                     for i in range(num_envs)]
+
+    def reset(self):
+        """
+        Starts new games in every environment
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        observations : ndarray
+        infos : list
+        """
+        infos = [env.reset()[1] for env in self.envs]
+        return self.observations, infos
+
+    def step(self, actions):
+        """
+        Applies one action to every environment, restarting finished games
+
+        Parameters
+        ----------
+        actions : list
+            action for every environment
+
+        Returns
+        -------
+        observations : ndarray
+            read-only view of all boards, finished games already restarted
+        rewards : ndarray
+            points scored by every environment
+        dones : ndarray
+            True for environments whose game ended on this step
+        infos : list
+            info of every environment from before any restart
+        """
+        rewards = np.zeros(len(self.envs), np.int64)
+        dones = np.zeros(len(self.envs), bool)
+        infos = []
+
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            observation, rewards[i], dones[i], info = env.step(action)
+            infos.append(info)
+            if dones[i]:
+                env.reset()
+
+        return self.observations, rewards, dones, infos
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+
+"""
+Frame profiler.
+
+Times where every frame goes: polling input, updating the simulation's timers,
+moving the falling piece, drawing, and pushing the frame to the display. Sections
+can nest, and the time spent in a nested section is only counted there, so the
+sections of a frame never add up to more than the frame. The last frames are
+kept for rolling percentiles, a frame that takes longer than one frame at the
+target rate counts as dropped, and every frame can be written to a CSV file.
+Nothing in here imports pygame.
+"""
+
+from collections import deque
+from time import perf_counter
+import atexit
+import csv
+
+from .settings import fps, profile_window
+
+SECTIONS = ('input', 'timer_update', 'piece_update', 'draw', 'display_update')
+
+def percentile(values, fraction):
+    """
+    Returns a percentile of sorted values by the nearest rank
+
+    Parameters
+    ----------
+    values : list
+        sorted values
+    fraction : float
+        0.95 for the 95th percentile
+
+    Returns
+    -------
+    float
+        0.0 if there are no values
+    """
+    if not values:
+        return 0.0
+
+    rank = max(int(fraction * len(values) + 0.5), 1)
+    return values[min(rank, len(values)) - 1]
+
+class FrameProfiler:
+    """
+    A class to time the sections of every frame.
+
+    ...
+
+    Attributes
+    ----------
+    target_fps : int
+        frame rate the game aims for
+    budget : float
+        time of one frame at the target rate in ms, infinite when the frame
+        rate is not capped
+    sections : tuple
+        names of the sections timed
+    frame_times : deque
+        time of each of the last frames in ms
+    section_times : dict
+        deque of the time of each of the last frames in ms by section
+    frames : int
+        frames timed since the start
+    dropped : int
+        frames since the start that went over the budget
+    current : dict
+        time in s spent in every section of the frame being timed
+    stack : list
+        name, start time, and time in nested sections of every open section
+    frame_start : float
+        time the frame being timed began
+    last_start : float
+        time the previous frame began, None before the first frame
+    interval : float
+        time between the starts of the last two frames in ms
+    file : file object
+        CSV file the frames are written to, None for no file
+    writer : csv writer object
+        writes a row to file for every frame
+
+    Methods
+    -------
+    def begin_frame():
+        starts timing a frame
+
+    def start(name):
+        starts timing a section
+
+    def stop():
+        stops timing the last section started
+
+    def wrap(name, function):
+        returns function timed as a section
+
+    def end_frame():
+        stores the times of the frame
+
+    def summary():
+        returns percentiles of the last frames
+
+    def close():
+        closes the CSV file
+    """
+    def __init__(self, target_fps = fps, window = profile_window, csv_path = None,
+                 sections = SECTIONS):
+        """
+        Constructs all necessary attributes for the FrameProfiler class
+
+        Parameters
+        ----------
+        target_fps : int
+            frame rate the game aims for, 0 if it is not capped
+        window : int
+            number of frames the percentiles are taken over
+        csv_path : str
+            file to write the times of every frame to, None for no file
+        sections : tuple
+            names of the sections timed
+        """
+        self.target_fps = target_fps
+        # an uncapped clock has no budget, so no frame is dropped
+        self.budget = 1000 / target_fps if target_fps else float('inf')
+        self.sections = sections
+        self.frame_times = deque(maxlen = window)
+        self.section_times = {name: deque(maxlen = window) for name in sections}
+        self.frames = 0
+        self.dropped = 0
+
+        self.current = dict.fromkeys(sections, 0.0)
+        self.stack = []
+        self.frame_start = perf_counter()
+        self.last_start = None
+        self.interval = 0.0
+
+        self.file = None
+        self.writer = None
+        if csv_path:
+            self.file = open(csv_path, 'w', newline = '')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(['frame', 'interval_ms', 'frame_ms'] +
+                                 [name + '_ms' for name in sections] +
+                                 ['other_ms', 'dropped'])
+            # the game quits from more than one place
+            atexit.register(self.close)
+
+    def begin_frame(self):
+        """
+        Starts timing a frame
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.frame_start = perf_counter()
+        if self.last_start is not None:
+            self.interval = (self.frame_start - self.last_start) * 1000
+        self.last_start = self.frame_start
+
+    def start(self, name):
+        """
+        Starts timing a section, inside any section already started
+
+        Parameters
+        ----------
+        name : str
+            one of sections
+
+        Returns
+        -------
+        None
+        """
+        self.stack.append([name, perf_counter(), 0.0])
+
+    def stop(self):
+        """
+        Stops timing the last section started
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        name, started, nested = self.stack.pop()
+        elapsed = perf_counter() - started
+        self.current[name] += elapsed - nested
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def wrap(self, name, function):
+        """
+        Returns a function that times every call of another as a section
+
+        Parameters
+        ----------
+        name : str
+            one of sections
+        function : function
+            function to time
+
+        Returns
+        -------
+        function
+        """
+        start, stop = self.start, self.stop
+
+        def timed(*args, **kwargs):
+            start(name)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stop()
+
+        return timed
+
+    def end_frame(self):
+        """
+        Stores the times of the frame and writes them to the CSV file
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        frame_time : float
+            time of the frame in ms
+        """
+        frame_time = (perf_counter() - self.frame_start) * 1000
+        dropped = frame_time > self.budget
+        self.frames += 1
+        self.dropped += dropped
+        self.frame_times.append(frame_time)
+
+        times = [self.current[name] * 1000 for name in self.sections]
+        for name, section_time in zip(self.sections, times):
+            self.section_times[name].append(section_time)
+            self.current[name] = 0.0
+
+        if self.writer:
+            self.writer.writerow(
+                [self.frames, round(self.interval, 4), round(frame_time, 4)] +
+                [round(section_time, 4) for section_time in times] +
+                [round(max(frame_time - sum(times), 0.0), 4), int(dropped)])
+
+        return frame_time
+
+    def summary(self):
+        """
+        Returns percentiles of the frame time over the last frames
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            frames and dropped in the window, p50, p95, p99, and max frame
+            time in ms, mean time of every section in ms, and total_frames
+            and total_dropped since the start
+        """
+        times = sorted(self.frame_times)
+        budget = self.budget
+        return {
+            'frames': len(times),
+            'dropped': sum(frame_time > budget for frame_time in times),
+            'p50': percentile(times, 0.50),
+            'p95': percentile(times, 0.95),
+            'p99': percentile(times, 0.99),
+            'max': times[-1] if times else 0.0,
+            'sections': {name: sum(section) / len(section) if section else 0.0
+                         for name, section in self.section_times.items()},
+            'total_frames': self.frames,
+            'total_dropped': self.dropped
+        }
+
+    def close(self):
+        """
+        Closes the CSV file if one is open
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            self.writer = None
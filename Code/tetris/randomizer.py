@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+"""
+Piece randomizers.
+
+Each randomizer draws shapes from its own random.Random, so a game started with
+the same seed gets the same pieces on every machine. ShapeQueue keeps the
+upcoming shapes in a deque for the preview.
+"""
+
+from collections import deque
+from random import Random
+
+from .settings import tetromino_dict, preview_depth
+
+SHAPES = tuple(tetromino_dict)
+
+class UniformRandomizer:
+    """
+    A class to pick every shape with the same chance.
+
+    ...
+
+    Attributes
+    ----------
+    rng : Random object
+        source of random numbers
+
+    Methods
+    -------
+    def next_shape():
+        returns the next shape
+    """
+    def __init__(self, seed = None):
+        """
+        Constructs all necessary attributes for the UniformRandomizer class
+
+        Parameters
+        ----------
+        seed : int
+            seed of the random numbers, random if None
+        """
+        self.rng = Random(seed)
+
+    def next_shape(self):
+        """
+        Returns the next shape
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+        """
+        return self.rng.choice(SHAPES)
+
+class BagRandomizer(UniformRandomizer):
+    """
+    A class to deal shapes from shuffled bags of all seven.
+
+    ...
+
+    Attributes
+    ----------
+    rng : Random object
+        source of random numbers
+    bag : list
+        shapes left in the current bag
+
+    Methods
+    -------
+    def next_shape():
+        returns the next shape
+    """
+    def __init__(self, seed = None):
+        """
+        Constructs all necessary attributes for the BagRandomizer class
+
+        Parameters
+        ----------
+        seed : int
+            seed of the random numbers, random if None
+        """
+        super().__init__(seed)
+        self.bag = []
+
+    def next_shape(self):
+        """
+        Returns the next shape, refilling the bag once it is empty
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+        """
+        if not self.bag:
+            self.bag = list(SHAPES)
+            self.rng.shuffle(self.bag)
+
+        return self.bag.pop()
+
+class HistoryRandomizer(UniformRandomizer):
+    """
+    A class to pick shapes, rerolling ones that were dealt recently.
+
+    ...
+
+    Attributes
+    ----------
+    rng : Random object
+        source of random numbers
+    history : deque
+        most recent shapes
+    rolls : int
+        most tries to find a shape not in the history
+
+    Methods
+    -------
+    def next_shape():
+        returns the next shape
+    """
+    def __init__(self, seed = None, history = 4, rolls = 4):
+        """
+        Constructs all necessary attributes for the HistoryRandomizer class
+
+        Parameters
+        ----------
+        seed : int
+            seed of the random numbers, random if None
+        history : int
+            number of recent shapes to avoid
+        rolls : int
+            most tries to find a shape not in the history
+        """
+        super().__init__(seed)
+        self.history = deque(maxlen = history)
+        self.rolls = rolls
+
+    def next_shape(self):
+        """
+        Returns the next shape
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str
+        """
+        for roll in range(self.rolls):
+            shape = self.rng.choice(SHAPES)
+            if shape not in self.history:
+                break
+
+        self.history.append(shape)
+        return shape
+
+RANDOMIZERS = {
+    'uniform': UniformRandomizer,
+    'bag': BagRandomizer,
+    'history': HistoryRandomizer
+}
+
+def make_randomizer(kind = 'uniform', seed = None):
+    """
+    Creates a randomizer by name
+
+    Parameters
+    ----------
+    kind : str
+        'uniform', 'bag', or 'history'
+    seed : int
+        seed of the random numbers, random if None
+
+    Returns
+    -------
+    randomizer object
+    """
+    if kind not in RANDOMIZERS:
+        raise ValueError("unknown randomizer {!r}, expected one of {}".format(
+            kind, ', '.join(RANDOMIZERS)))
+
+    return RANDOMIZERS[kind](seed)
+
+class ShapeQueue:
+    """
+    A class to hold the upcoming shapes.
+
+    ...
+
+    Attributes
+    ----------
+    randomizer : randomizer object
+        deals the shapes
+    next_shapes : deque
+        upcoming shapes, next one first
+
+    Methods
+    -------
+    def get_next_shape():
+        takes the next shape and deals a new one to the back
+    """
+    def __init__(self, randomizer, depth = preview_depth):
+        """
+        Constructs all necessary attributes for the ShapeQueue class
+
+        Parameters
+        ----------
+        randomizer : randomizer object
+            deals the shapes
+        depth : int
+            number of upcoming shapes kept
+        """
+        self.randomizer = randomizer
+        self.next_shapes = deque(randomizer.next_shape() for shape in range(depth))
+
+    def get_next_shape(self):
+        """
+        Takes the next shape and deals a new one to the back
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        next_shape : str
+            The next shape to be placed
+        """
+        if not self.next_shapes:
+            return self.randomizer.next_shape()
+        
+        next_shape = self.next_shapes.popleft()
+        self.next_shapes.append(self.randomizer.next_shape())
+        return next_shape
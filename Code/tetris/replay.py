@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+
+"""
+Game replays.
+
+A game is fully decided by its randomizer, its seed and the keys held on every
+simulation step, so that is all a replay stores. The log is binary: a fixed
+header followed by one record per change of the held keys, each a varint count
+of steps since the previous change and one byte of key bits. A replay can be
+played back headlessly as fast as the CPU allows with simulate(), or fed to the
+pygame front end at any playback rate.
+"""
+
+import struct
+
+from .engine import Board
+from .randomizer import RANDOMIZERS, ShapeQueue, make_randomizer
+from .settings import columns, rows, tick_rate
+from .simulation import Simulation
+from .timing import SimulationClock
+
+MAGIC = b'TTRP'
+VERSION = 1
+HEADER = struct.Struct('<4sBBQHBB')
+END = 0x80
+
+# seeds fit the unsigned 64 bit field of the header
+MAX_SEED = 2 ** 64 - 1
+
+KINDS = list(RANDOMIZERS)
+
+def pack_keys(keys):
+    """
+    Packs left, right, up, and down into the low four bits of a byte
+
+    Parameters
+    ----------
+    keys : tuple
+        left, right, up, and down key held
+
+    Returns
+    -------
+    int
+    """
+    left, right, up, down = keys
+    return bool(left) | bool(right) << 1 | bool(up) << 2 | bool(down) << 3
+
+def unpack_keys(bits):
+    """
+    Unpacks a byte of key bits
+
+    Parameters
+    ----------
+    bits : int
+        key bits made by pack_keys
+
+    Returns
+    -------
+    tuple
+        left, right, up, and down key held
+    """
+    return (bool(bits & 1), bool(bits & 2), bool(bits & 4), bool(bits & 8))
+
+def write_varint(data, value):
+    """
+    Appends an unsigned integer in 7 bit groups
+
+    Parameters
+    ----------
+    data : bytearray
+        buffer to append to
+    value : int
+        value to write
+
+    Returns
+    -------
+    None
+    """
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+
+def read_varint(data, pos):
+    """
+    Reads an unsigned integer written by write_varint
+
+    Parameters
+    ----------
+    data : bytes
+        buffer to read from
+    pos : int
+        position of the first byte
+
+    Returns
+    -------
+    value : int
+    pos : int
+        position after the value
+    """
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class Replay:
+    """
+    A class to hold a recorded game.
+
+    ...
+
+    Attributes
+    ----------
+    kind : str
+        name of the randomizer
+    seed : int
+        seed of the randomizer
+    tick_rate : int
+        simulation steps per second of the recording
+    columns : int
+        width of the field
+    rows : int
+        height of the field
+    events : list
+        (steps since the last change, key bits) for every change of keys
+    steps : int
+        total number of steps recorded
+
+    Methods
+    -------
+    def make_shape_queue():
+        creates the shape queue the game was played with
+
+    def iter_keys():
+        yields the held keys for every step
+
+    def to_bytes():
+        encodes the replay
+
+    def from_bytes(data):
+        decodes a replay
+
+    def save(path):
+        writes the replay to a file
+
+    def load(path):
+        reads a replay from a file
+    """
+    def __init__(self, kind, seed, events = None, steps = 0,
+                 tick_rate = tick_rate, columns = columns, rows = rows):
+        """
+        Constructs all necessary attributes for the Replay class
+
+        Parameters
+        ----------
+        kind : str
+            name of the randomizer
+        seed : int
+            seed of the randomizer
+        events : list
+            (steps since the last change, key bits) for every change of keys
+        steps : int
+            total number of steps recorded
+        tick_rate : int
+            simulation steps per second of the recording
+        columns : int
+            width of the field
+        rows : int
+            height of the field
+        """
+        self.kind = kind
+        self.seed = seed
+        self.events = events if events is not None else []
+        self.steps = steps
+        self.tick_rate = tick_rate
+        self.columns = columns
+        self.rows = rows
+
+    def make_shape_queue(self):
+        """
+        Creates the shape queue the game was played with
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        ShapeQueue object
+        """
+        return ShapeQueue(make_randomizer(self.kind, self.seed))
+
+    def iter_keys(self):
+        """
+        Yields the held keys for every recorded step
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        generator of tuple
+            left, right, up, and down key held
+        """
+        keys = (False, False, False, False)
+        step = 0
+        for delta, bits in self.events:
+            for i in range(delta):
+                yield keys
+            step += delta
+            keys = unpack_keys(bits)
+
+        for i in range(self.steps - step):
+            yield keys
+
+    def to_bytes(self):
+        """
+        Encodes the replay
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        bytes
+        """
+        data = bytearray(HEADER.pack(MAGIC, VERSION, KINDS.index(self.kind),
+                                     self.seed, self.tick_rate, self.columns,
+                                     self.rows))
+        step = 0
+        for delta, bits in self.events:
+            write_varint(data, delta)
+            data.append(bits)
+            step += delta
+
+        write_varint(data, self.steps - step)
+        data.append(END)
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Decodes a replay made by to_bytes
+
+        Data cut off, of another version or of an unknown randomizer raises
+        ValueError.
+
+        Parameters
+        ----------
+        data : bytes
+            encoded replay
+
+        Returns
+        -------
+        Replay object
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("not a version {} replay".format(VERSION))
+
+        magic, version, kind, seed, rate, width, height = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a version {} replay".format(VERSION))
+
+        if kind >= len(KINDS):
+            raise ValueError("replay of unknown randomizer {}, expected 0 to {}".format(
+                kind, len(KINDS) - 1))
+
+        events = []
+        steps = 0
+        pos = HEADER.size
+        try:
+            while True:
+                delta, pos = read_varint(data, pos)
+                bits = data[pos]
+                pos += 1
+                steps += delta
+                if bits == END:
+                    break
+                events.append((delta, bits))
+        except IndexError:
+            raise ValueError("replay is cut off after {} steps".format(steps)) from None
+
+        return cls(KINDS[kind], seed, events, steps, rate, width, height)
+
+    def save(self, path):
+        """
+        Writes the replay to a file
+
+        Parameters
+        ----------
+        path : str
+            file to write
+
+        Returns
+        -------
+        None
+        """
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a replay from a file
+
+        Parameters
+        ----------
+        path : str
+            file to read
+
+        Returns
+        -------
+        Replay object
+        """
+        with open(path, 'rb') as file:
+            return cls.from_bytes(file.read())
+
+class ReplayRecorder:
+    """
+    A class to record the keys of a game step by step.
+
+    ...
+
+    Attributes
+    ----------
+    replay : Replay object
+        replay being recorded
+    last_bits : int
+        key bits of the last change
+    last_step : int
+        step of the last change
+
+    Methods
+    -------
+    def record(keys):
+        records the keys held on the next step
+    """
+    def __init__(self, kind, seed):
+        """
+        Constructs all necessary attributes for the ReplayRecorder class
+
+        Parameters
+        ----------
+        kind : str
+            name of the randomizer
+        seed : int
+            seed of the randomizer, from 0 to MAX_SEED
+        """
+        # checked here so a bad seed fails when the game starts, not when
+        # its replay is saved at the end
+        if not 0 <= seed <= MAX_SEED:
+            raise ValueError("replay seeds run from 0 to {}, not {}".format(MAX_SEED, seed))
+
+        self.replay = Replay(kind, seed)
+        self.last_bits = 0
+        self.last_step = 0
+
+    def record(self, keys):
+        """
+        Records the keys held on the next step, storing only changes
+
+        Parameters
+        ----------
+        keys : tuple
+            left, right, up, and down key held
+
+        Returns
+        -------
+        None
+        """
+        bits = pack_keys(keys)
+        if bits != self.last_bits:
+            self.replay.events.append((self.replay.steps - self.last_step, bits))
+            self.last_bits = bits
+            self.last_step = self.replay.steps
+
+        self.replay.steps += 1
+
+def simulate(replay):
+    """
+    Plays a replay back headlessly as fast as possible
+
+    Parameters
+    ----------
+    replay : Replay object
+        replay to play
+
+    Returns
+    -------
+    simulation : Simulation object
+        the game as it stood after the last recorded step
+    """
+    simulation = Simulation(replay.make_shape_queue().get_next_shape,
+                            board = Board(replay.columns, replay.rows),
+                            clock = SimulationClock(1000 / replay.tick_rate))
+    for keys in replay.iter_keys():
+        simulation.step(*keys)
+
+    return simulation
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""
+Precomputed rotations.
+
+Every shape in tetromino_dict is rotated into its four orientations once, on
+import, so rotating a piece is a table lookup with integer offsets instead of
+floating point trig. Each orientation also gets a footprint of row bitmasks
+that a BitBoard can AND against its rows to test the whole piece at once.
+"""
+
+from .settings import tetromino_dict
+
+def rotate_offsets(offsets):
+    """
+    Rotates offsets by 90 degrees around (0, 0)
+
+    Turns the same way as pygame.Vector2.rotate(90) does on screen, so pieces
+    rotate as they always have.
+
+    Parameters
+    ----------
+    offsets : list
+        (x, y) offsets from the pivot block
+
+    Returns
+    -------
+    tuple
+    """
+    return tuple((-y, x) for x, y in offsets)
+
+def make_footprint(offsets):
+    """
+    Turns offsets into row bitmasks
+
+    Parameters
+    ----------
+    offsets : tuple
+        (x, y) offsets from the pivot block
+
+    Returns
+    -------
+    left : int
+        smallest x offset, bit 0 of the masks
+    right : int
+        largest x offset
+    top : int
+        smallest y offset, row of the first mask
+    masks : tuple
+        bitmask of every row from top down
+    """
+    left = min(x for x, y in offsets)
+    right = max(x for x, y in offsets)
+    top = min(y for x, y in offsets)
+    masks = [0] * (max(y for x, y in offsets) - top + 1)
+    for x, y in offsets:
+        masks[y - top] |= 1 << (x - left)
+
+    return left, right, top, tuple(masks)
+
+# shape -> four orientations of (x, y) offsets, pivot block first
+ROTATIONS = {}
+for shape, data in tetromino_dict.items():
+    orientations = [tuple(tuple(pos) for pos in data['shape'])]
+    for turn in range(3):
+        orientations.append(rotate_offsets(orientations[-1]))
+    ROTATIONS[shape] = tuple(orientations)
+
+# shape -> four orientations of (left, right, top, masks)
+FOOTPRINTS = {shape: tuple(make_footprint(offsets) for offsets in orientations)
+              for shape, orientations in ROTATIONS.items()}
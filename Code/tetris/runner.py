@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+
+"""
+Parallel game runner.
+
+Plays headless games across a ProcessPoolExecutor for simulation sweeps. A
+game is described by a spec (seed, randomizer, start speed, board size, policy,
+size of the bot's transposition table and piece limit), games are sent to the
+workers in chunks, and every worker keeps one engine per board size and resets
+it between games instead of building a new one. Results, with the hits and
+misses of the bot's table, stream back as the chunks finish and can be written
+to a columnar JSON file, one list per column.
+
+Run a sweep from the Code folder with python -m tetris.runner.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice, product
+from random import Random
+import argparse
+import json
+import os
+
+from .ai import Bot
+from .bitboard import BitBoard
+from .engine import Engine, LEFT, RIGHT, ROTATE, DROP
+from .randomizer import ShapeQueue, make_randomizer
+from .settings import columns, rows, start_speed, tick_rate, randomizer, preview_depth
+
+DEFAULT_SPEC = {
+    'seed': 0,
+    'kind': randomizer,
+    'start_speed': start_speed,
+    'columns': columns,
+    'rows': rows,
+    'policy': 'random',
+    'table_size': 0,
+    'max_pieces': None
+}
+
+RESULT_COLUMNS = ('seed', 'kind', 'start_speed', 'columns', 'rows', 'policy',
+                  'table_size', 'score', 'lines', 'level', 'pieces_placed', 'steps',
+                  'table_hits', 'table_misses')
+
+class RandomPolicy:
+    """
+    A class to play every piece to a random rotation and column.
+
+    ...
+
+    Attributes
+    ----------
+    rng : Random object
+        source of random numbers
+
+    Methods
+    -------
+    def actions(engine, next_shapes):
+        returns the actions for the falling piece
+    """
+    def __init__(self, seed = None, table_size = 0):
+        """
+        Constructs all necessary attributes for the RandomPolicy class
+
+        Parameters
+        ----------
+        seed : int
+            seed of the random numbers, random if None
+        table_size : int
+            not used, the policy searches nothing, taken so it can be made
+            like the bot
+        """
+        self.rng = Random(seed)
+
+    def actions(self, engine, next_shapes):
+        """
+        Returns the actions that play the falling piece
+
+        Parameters
+        ----------
+        engine : Engine object
+            game to play
+        next_shapes : deque
+            upcoming shapes
+
+        Returns
+        -------
+        list
+            engine actions, ending with DROP
+        """
+        half = engine.board.columns // 2
+        shift = self.rng.randint(-half, half)
+        return ([ROTATE] * self.rng.randrange(4) +
+                [LEFT if shift < 0 else RIGHT] * abs(shift) + [DROP])
+
+POLICIES = {
+    'random': RandomPolicy,
+    'bot': Bot
+}
+
+def make_policy(name, seed = None, table_size = 0):
+    """
+    Creates a policy by name
+
+    Parameters
+    ----------
+    name : str
+        key of POLICIES
+    seed : int
+        seed of the policy's random numbers, random if None
+    table_size : int
+        most entries in the bot's transposition table, 0 for no table
+
+    Returns
+    -------
+    policy object
+    """
+    if name not in POLICIES:
+        raise ValueError("unknown policy {!r}, expected one of {}".format(
+            name, ', '.join(POLICIES)))
+
+    return POLICIES[name](seed, table_size = table_size)
+
+# engines kept by this process, one per board size
+engines = {}
+
+def get_engine(columns, rows):
+    """
+    Returns this process's engine for a board size, creating it once
+
+    Parameters
+    ----------
+    columns : int
+        width of the field
+    rows : int
+        height of the field
+
+    Returns
+    -------
+    Engine object
+    """
+    key = (columns, rows)
+    if key not in engines:
+        engines[key] = Engine(board = BitBoard(columns, rows))
+
+    return engines[key]
+
+def play_game(spec):
+    """
+    Plays one game headlessly
+
+    Every action takes one simulation step, and gravity moves the piece down
+    at the speed of the current level, the same as in a timed game.
+
+    Parameters
+    ----------
+    spec : dict
+        keys of DEFAULT_SPEC, missing ones take the default
+
+    Returns
+    -------
+    result : dict
+        values of RESULT_COLUMNS
+    """
+    spec = dict(DEFAULT_SPEC, **spec)
+    engine = get_engine(spec['columns'], spec['rows'])
+    shape_queue = ShapeQueue(make_randomizer(spec['kind'], spec['seed']), preview_depth)
+    engine.reset(shape_queue.get_next_shape, speed = spec['start_speed'])
+    policy = make_policy(spec['policy'], spec['seed'], spec['table_size'])
+    max_pieces = spec['max_pieces']
+
+    step_time = 1000 / tick_rate
+    elapsed = 0.0
+    steps = 0
+    while not engine.game_over and (max_pieces is None or engine.pieces_placed < max_pieces):
+        piece = engine.piece
+        for action in policy.actions(engine, shape_queue.next_shapes):
+            engine.act(action)
+            steps += 1
+
+            # gravity
+            elapsed += step_time
+            while elapsed >= engine.down_speed and engine.piece is piece and not engine.game_over:
+                elapsed -= engine.down_speed
+                engine.move_down()
+
+            if engine.piece is not piece or engine.game_over:
+                break
+
+        else:
+            # the policy left the piece hanging
+            engine.drop()
+            steps += 1
+
+    table = getattr(policy, 'table', None)
+    result = {column: spec[column] for column in RESULT_COLUMNS if column in spec}
+    result.update(score = engine.current_score, lines = engine.current_lines,
+                  level = engine.current_level, pieces_placed = engine.pieces_placed,
+                  steps = steps, table_hits = table.hits if table else 0,
+                  table_misses = table.misses if table else 0)
+    return result
+
+def play_games(specs):
+    """
+    Plays a chunk of games in one worker
+
+    Parameters
+    ----------
+    specs : list
+        spec of every game
+
+    Returns
+    -------
+    list
+        result of every game
+    """
+    return [play_game(spec) for spec in specs]
+
+def make_specs(seeds, kinds = (randomizer,), speeds = (start_speed,),
+               sizes = ((columns, rows),), policies = ('random',), max_pieces = None,
+               table_size = 0):
+    """
+    Yields a spec for every combination of the values given
+
+    Parameters
+    ----------
+    seeds : iterable
+        seeds of the games
+    kinds : iterable
+        names of randomizers
+    speeds : iterable
+        start speeds in ms
+    sizes : iterable
+        (columns, rows) of the boards
+    policies : iterable
+        names of policies
+    max_pieces : int
+        most pieces in a game, no limit if None
+    table_size : int
+        most entries in the bot's transposition table, 0 for no table
+
+    Returns
+    -------
+    generator of dict
+    """
+    for seed, kind, speed, (width, height), policy in product(
+            seeds, kinds, speeds, sizes, policies):
+        yield {'seed': seed, 'kind': kind, 'start_speed': speed, 'columns': width,
+               'rows': height, 'policy': policy, 'table_size': table_size,
+               'max_pieces': max_pieces}
+
+def run_games(specs, workers = None, chunk_size = 16):
+    """
+    Plays games across worker processes and yields results as they finish
+
+    Only a few chunks per worker are queued at a time, so specs can be a
+    generator of any length.
+
+    Parameters
+    ----------
+    specs : iterable
+        spec of every game
+    workers : int
+        number of processes, one per CPU if None
+    chunk_size : int
+        games sent to a worker at once
+
+    Returns
+    -------
+    generator of dict
+        result of every game, in the order they finish
+    """
+    workers = workers or os.cpu_count() or 1
+    specs = iter(specs)
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = set()
+        while True:
+            while len(pending) < workers * 2:
+                chunk = list(islice(specs, chunk_size))
+                if not chunk:
+                    break
+                pending.add(executor.submit(play_games, chunk))
+
+            if not pending:
+                return
+
+            done, pending = wait(pending, return_when = FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+def write_columns(path, results):
+    """
+    Writes results to a JSON file with one list per column
+
+    Parameters
+    ----------
+    path : str
+        file to write
+    results : iterable
+        result of every game, as yielded by run_games
+
+    Returns
+    -------
+    int
+        number of games written
+    """
+    table = {column: [] for column in RESULT_COLUMNS}
+    for result in results:
+        for column, values in table.items():
+            values.append(result[column])
+
+    with open(path, 'w') as file:
+        json.dump(table, file)
+
+    return len(table['seed'])
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Play headless games in parallel")
+    parser.add_argument('--games', type = int, default = 100,
+                        help = "number of seeds, every combination is played once per seed")
+    parser.add_argument('--seed', type = int, default = 0, help = "first seed")
+    parser.add_argument('--kinds', nargs = '+', default = [randomizer])
+    parser.add_argument('--speeds', nargs = '+', type = float, default = [start_speed])
+    parser.add_argument('--sizes', nargs = '+', default = ['{}x{}'.format(columns, rows)],
+                        help = "board sizes as COLUMNSxROWS")
+    parser.add_argument('--policies', nargs = '+', default = ['random'])
+    parser.add_argument('--max-pieces', type = int)
+    parser.add_argument('--table-size', type = int, default = 0,
+                        help = "searches the bot remembers between pieces, 0 for none")
+    parser.add_argument('--workers', type = int)
+    parser.add_argument('--out', default = 'results.json')
+    args = parser.parse_args()
+
+    sizes = [tuple(int(n) for n in size.split('x')) for size in args.sizes]
+    specs = make_specs(range(args.seed, args.seed + args.games), args.kinds,
+                       args.speeds, sizes, args.policies, args.max_pieces, args.table_size)
+    count = write_columns(args.out, run_games(specs, args.workers))
+    print("{} games written to {}".format(count, args.out))
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+"""
+Game settings.
+
+Sizes, speeds, colours, shapes and the score table used by both the headless
+engine and the pygame front end. Nothing in here imports pygame, so the engine
+can be used without a display.
+
+Config holds a copy of the run options for one game with any of them changed.
+The front end reads its run options (randomizer, seed, preview, frame and tick
+rate, replays, rendering, asset loading, sound and profiling) from a Config, so
+they can be set from the command line without editing this file. Sizes, speeds,
+shapes and colours are fixed once modules import them, so Config rejects them
+rather than take a value it would never apply.
+"""
+
+# Size of game
+columns = 10
+rows = 20
+cell_size = 40
+game_width, game_height = columns * cell_size, rows * cell_size
+
+# Size of side bar
+sidebar_width = 200
+preview_height_frac = 0.7
+score_height_frac = 1 -  preview_height_frac
+
+# Window
+padding = 20
+window_width = game_width + sidebar_width + padding * 3
+window_height = game_height + padding * 2
+
+# game behaviour 
+start_speed = 300 # lower number means faster
+move_speed = 75
+rotate_speed = 150
+block_offset = (columns // 2, -1)
+
+# pieces
+randomizer = 'uniform' # 'uniform', 'bag', or 'history'
+seed = None # same seed, same pieces; None for a new game every time
+preview_depth = 3 # upcoming shapes shown
+
+# replays
+save_replays = True # write every game to replay_folder when it ends
+replay_folder = 'replays'
+
+# frame rate
+fps = 120 # most frames drawn per second
+tick_rate = 120 # fixed simulation steps per second, independent of fps
+event_driven = True # sleep until the next timer or input event
+
+# rendering
+dirty_rendering = True # only redraw and update what changed
+text_cache_size = 16 # rendered labels kept by the score panel
+
+# assets
+asset_workers = 4 # threads decoding images at startup, 0 to decode one by one
+asset_cache = None # folder to keep decoded images in for the next start, None for no cache
+
+# sound
+music_volume = 0.1
+sound_effects = {'lock': 'music/lock.wav', 'clear': 'music/clear.wav'} # missing files are skipped
+sound_volume = 0.3
+sound_channels = 4 # mixer channels kept for sound effects, so they never cut each other off
+
+# profiling
+profile_frames = False # time every frame and show the timings on screen
+profile_window = 600 # frames the percentiles are taken over
+profile_csv = None # file to write the timings of every frame to, None for no file
+
+# Colors
+YELLOW = '#f1e60d'
+RED = '#e51b20'
+BLUE = '#204b9b'
+GREEN = '#65b32e'
+PURPLE = '#7b217f'
+CYAN = '#6cc6d9'
+ORANGE = '#f07e13'
+GRAY = '#1C1C1C'
+DARK_PURPLE = '#301934'
+
+LINE_COLOR = '#FFFFFF'
+
+# shapes
+tetromino_dict = {
+	'T': {'shape': [(0,0), (-1,0), (1,0), (0,-1)], 'color': PURPLE},
+	'O': {'shape': [(0,0), (0,-1), (1,0), (1,-1)], 'color': YELLOW},
+	'J': {'shape': [(0,0), (0,-1), (0,1), (-1,1)], 'color': BLUE},
+	'L': {'shape': [(0,0), (0,-1), (0,1), (1,1)], 'color': ORANGE},
+	'I': {'shape': [(0,0), (0,-1), (0,-2), (0,1)], 'color': CYAN},
+	'S': {'shape': [(0,0), (-1,0), (0,-1), (1,-1)], 'color': GREEN},
+	'Z': {'shape': [(0,0), (1,0), (0,-1), (-1,-1)], 'color': RED}
+}
+
+SCORE_DATA = {1: 40, 2: 100, 3: 300, 4: 1200}
+
+# settings the front end reads from a Config for every game
+RUN_OPTIONS = ('randomizer', 'seed', 'preview_depth', 'save_replays',
+               'replay_folder', 'fps', 'tick_rate', 'event_driven',
+               'dirty_rendering', 'text_cache_size', 'asset_workers',
+               'asset_cache', 'music_volume', 'sound_effects', 'sound_volume',
+               'sound_channels', 'profile_frames', 'profile_window',
+               'profile_csv')
+
+class Config:
+    """
+    A class to hold the settings of one game.
+
+    ...
+
+    Attributes
+    ----------
+    one attribute per name in RUN_OPTIONS (randomizer, seed, fps,
+    save_replays, ...), the module's value unless the constructor was given
+    another
+
+    Methods
+    -------
+    def replace(**changes):
+        returns a copy with some settings changed
+    """
+    def __init__(self, **changes):
+        """
+        Constructs all necessary attributes for the Config class
+
+        Parameters
+        ----------
+        **changes
+            run options to use instead of the module's, by name
+        """
+        settings = {name: globals()[name] for name in RUN_OPTIONS}
+        unknown = set(changes) - set(settings)
+        if unknown:
+            raise TypeError("not run options: {}".format(', '.join(sorted(unknown))))
+
+        settings.update(changes)
+        self.__dict__.update(settings)
+
+    def replace(self, **changes):
+        """
+        Returns a copy with some settings changed
+
+        Parameters
+        ----------
+        **changes
+            settings to change, by name
+
+        Returns
+        -------
+        Config object
+        """
+        return Config(**dict(vars(self), **changes))
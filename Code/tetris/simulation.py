@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+
+"""
+Timed game simulation.
+
+Runs the engine with the same timers the pygame front end uses (gravity, key
+repeat and rotation delay) off a SimulationClock. Every step moves the clock by
+a fixed amount, applies the keys held during that step and updates the timers,
+so a game stepped headlessly at any speed plays out exactly like live play fed
+the same keys.
+"""
+
+from .engine import Engine
+from .settings import move_speed, rotate_speed
+from .timing import SimulationClock, Timer
+
+class Simulation:
+    """
+    A class to run the engine with timers in fixed steps.
+
+    ...
+
+    Attributes
+    ----------
+    clock : SimulationClock object
+        clock moved forward one step at a time
+    engine : Engine object
+        engine that runs the rules of the game
+    update_main_score : function
+        called with lines, score, and level after a line clear
+    down_pressed : bool
+        down key pressed bool state
+    timers : dict
+        different timers to represent actions completed
+    current_level : int
+        the current level
+
+    Methods
+    -------
+    def update_score(lines, score, level):
+        passes the score on and speeds up the timer on a new level
+
+    def move_down():
+        moves the piece down
+
+    def input(left, right, up, down):
+        applies held keys to the piece
+
+    def timer_update():
+        updates the timers
+
+    def step(left, right, up, down):
+        runs one fixed step
+
+    def act(action):
+        runs one fixed step with an engine action instead of keys
+
+    def get_timeout():
+        returns the time until the next timer runs out
+    """
+    def __init__(self, get_next_shape = None, update_score = None,
+                 board = None, first_shape = None, clock = None):
+        """
+        Constructs all necessary attributes for the Simulation class
+
+        Parameters
+        ----------
+        get_next_shape : function
+            returns the letter of the next shape, random if None
+        update_score : function
+            called with lines, score, and level after a line clear
+        board : Board object
+            the playing field, a new empty Board if None
+        first_shape : str
+            letter of the first piece, random if None
+        clock : SimulationClock object
+            clock for the timers, a new one if None
+        """
+        self.clock = clock if clock is not None else SimulationClock()
+        self.engine = Engine(get_next_shape, self.update_score, board, first_shape)
+        self.update_main_score = update_score
+
+        # timer
+        self.down_pressed = False
+
+        self.timers = {
+            'vertical move': Timer(self.engine.down_speed, True, self.move_down, self.clock),
+            'horizontal move': Timer(move_speed, clock = self.clock),
+            'rotate': Timer(rotate_speed, clock = self.clock)
+        }
+        self.timers['vertical move'].activate()
+
+        # score
+        self.current_level = 1
+
+    def update_score(self, lines, score, level):
+        """
+        Passes the score on and speeds up the fall on a new level
+
+        Parameters
+        ----------
+        lines : int
+            Number of lines cleared
+        score : int
+            User score
+        level : int
+            Current level of game
+
+        Returns
+        -------
+        None
+        """
+        if level != self.current_level:
+            self.current_level = level
+            self.timers["vertical move"].duration = self.engine.down_speed
+
+        if self.update_main_score:
+            self.update_main_score(lines, score, level)
+
+    def move_down(self):
+        """
+        Moves the piece down
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.engine.move_down()
+
+    def input(self, left, right, up, down):
+        """
+        Applies the held keys to the piece
+
+        Parameters
+        ----------
+        left : bool
+            left key held
+        right : bool
+            right key held
+        up : bool
+            rotate key held
+        down : bool
+            soft drop key held
+
+        Returns
+        -------
+        None
+        """
+        if not self.timers['horizontal move'].active:
+            if left:
+                self.engine.move_horizontal(-1)
+                self.timers['horizontal move'].activate()
+
+            if right:
+                self.engine.move_horizontal(1)
+                self.timers['horizontal move'].activate()
+
+        # check for rotation
+        if not self.timers['rotate'].active:
+            if up:
+                self.engine.rotate()
+                self.timers['rotate'].activate()
+
+        # down speedup
+        if not self.down_pressed and down:
+            self.down_pressed = True
+            self.timers['vertical move'].duration = self.engine.press_speed
+
+        if self.down_pressed and not down:
+            self.down_pressed = False
+            self.timers['vertical move'].duration = self.engine.down_speed
+
+    def timer_update(self):
+        """
+        Updates the timers
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        for timer in self.timers.values():
+            timer.update()
+
+    def step(self, left = False, right = False, up = False, down = False):
+        """
+        Moves the clock one step and applies the keys held during it
+
+        Parameters
+        ----------
+        left : bool
+            left key held
+        right : bool
+            right key held
+        up : bool
+            rotate key held
+        down : bool
+            soft drop key held
+
+        Returns
+        -------
+        None
+        """
+        self.clock.tick()
+        self.input(left, right, up, down)
+        self.timer_update()
+
+    def act(self, action):
+        """
+        Moves the clock one step and applies an engine action, as a bot does
+
+        Parameters
+        ----------
+        action : int
+            NOOP, LEFT, RIGHT, ROTATE, DOWN, or DROP
+
+        Returns
+        -------
+        None
+        """
+        self.clock.tick()
+        self.engine.act(action)
+        self.timer_update()
+
+    def get_timeout(self):
+        """
+        Returns the simulated time until the next active timer runs out
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        float or None
+            time in ms, None if no timer is active
+        """
+        times = [timer.time_left() for timer in self.timers.values() if timer.active]
+        return min(times) if times else None
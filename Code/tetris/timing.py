@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+
+"""
+Timers and clocks.
+
+Timers read the time from a clock object instead of pygame, so the same timer
+logic can run off the wall clock or off a simulation clock that only moves in
+fixed steps. Stepping a simulation clock by hand runs a game as fast as the
+CPU allows and gives the same result every time.
+"""
+
+from time import monotonic
+
+from .settings import tick_rate
+
+class WallClock:
+    """
+    A class to read real time in ms.
+
+    ...
+
+    Attributes
+    ----------
+    start : float
+        time the clock was created
+
+    Methods
+    -------
+    def get_ticks():
+        returns the time since the clock was created
+    """
+    def __init__(self):
+        """
+        Constructs all necessary attributes for the WallClock class
+
+        Parameters
+        ----------
+        None
+        """
+        self.start = monotonic()
+
+    def get_ticks(self):
+        """
+        Returns the time since the clock was created
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        float
+            time in ms
+        """
+        return (monotonic() - self.start) * 1000
+
+class SimulationClock:
+    """
+    A class to keep time that only moves in fixed steps.
+
+    ...
+
+    Attributes
+    ----------
+    step : float
+        length of a step in ms
+    frame : int
+        number of steps taken
+
+    Methods
+    -------
+    def get_ticks():
+        returns the simulated time
+
+    def tick():
+        moves the clock one step forward
+    """
+    def __init__(self, step = 1000 / tick_rate):
+        """
+        Constructs all necessary attributes for the SimulationClock class
+
+        Parameters
+        ----------
+        step : float
+            length of a step in ms
+        """
+        self.step = step
+        self.frame = 0
+
+    def get_ticks(self):
+        """
+        Returns the simulated time
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        float
+            time in ms
+        """
+        return self.frame * self.step
+
+    def tick(self):
+        """
+        Moves the clock one step forward
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.frame += 1
+
+class FixedStep:
+    """
+    A class to turn elapsed real time into whole simulation steps.
+
+    ...
+
+    Attributes
+    ----------
+    clock : SimulationClock object
+        clock whose step length is used
+    max_steps : int
+        most steps returned at once, extra time is dropped
+    accumulator : float
+        real time in ms not yet turned into a step
+
+    Methods
+    -------
+    def advance(elapsed):
+        adds elapsed time and returns the number of steps due
+    """
+    def __init__(self, clock, max_steps = tick_rate):
+        """
+        Constructs all necessary attributes for the FixedStep class
+
+        Parameters
+        ----------
+        clock : SimulationClock object
+            clock whose step length is used
+        max_steps : int
+            most steps returned at once, extra time is dropped
+        """
+        self.clock = clock
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, elapsed):
+        """
+        Adds elapsed time and returns the number of steps due
+
+        Parameters
+        ----------
+        elapsed : float
+            real time in ms since the last call
+
+        Returns
+        -------
+        steps : int
+        """
+        self.accumulator += elapsed
+        steps = int(self.accumulator // self.clock.step)
+
+        if steps > self.max_steps:
+            # too far behind to catch up, e.g. after the window was dragged
+            steps = self.max_steps
+            self.accumulator = 0.0
+
+        else:
+            self.accumulator -= steps * self.clock.step
+
+        return steps
+
+class Timer:
+    """
+    A class to represent a Timer.
+
+    ...
+
+    Attributes
+    ----------
+    duration : int
+        time passed
+    repeated : bool
+        time repeated
+    func : function
+        function representing timer
+    clock : clock object
+        anything with a get_ticks() method returning ms
+    start_time : int
+        time of start
+    active : bool
+        bool for timer activation
+
+    Methods
+    -------
+    def activate():
+        activates timer
+    
+    def deactivate():
+        deactivates timer
+    
+    def time_left():
+        returns the time until the timer runs out
+    
+    def update():
+        updates timer
+    """
+    def __init__(self, duration, repeated = False, func = None, clock = None):
+        """
+        Constructs all necessary attributes for the Timer class
+
+        Parameters
+        ----------
+        duration : int
+            time passed
+        repeated : bool
+            time repeated
+        func : function
+            function representing timer
+        clock : clock object
+            anything with a get_ticks() method, a WallClock if None
+        """
+        self.repeated = repeated
+        self.func = func
+        self.duration = duration
+        self.clock = clock if clock is not None else WallClock()
+        
+        self.start_time = 0
+        self.active = False
+        
+    def activate(self):
+        """
+        Activates timer
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.active = True
+        self.start_time = self.clock.get_ticks()
+        
+    def deactivate(self):
+        """
+        Deactivates timer
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        self.active = False
+        self.start_time = 0
+        
+    def time_left(self):
+        """
+        Returns the time until the timer runs out
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        float
+            time in ms, negative once it is due
+        """
+        return self.start_time + self.duration - self.clock.get_ticks()
+        
+    def update(self):
+        """
+        Updates timer
+        
+        Parameters
+        ----------
+        None
+        
+        Returns
+        -------
+        None
+        """
+        current_time = self.clock.get_ticks()
+        if current_time - self.start_time >= self.duration and self.active:
+            # call a function
+            if self.func:
+                self.func()
+            
+            # reset timer
+            self.deactivate()
+            
+            # repeat the timer
+            if self.repeated:
+                self.activate()
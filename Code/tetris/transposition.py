@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+"""
+Transposition table.
+
+The bot's lookahead reaches the same boards again and again: two placements in
+a different order, or the boards it searched one piece ahead and now searches
+again for the next piece. A search is keyed by the board and the shapes still
+to place on it, nothing about the turn it was made in, so the next turn finds
+it. The board part is its width, the weights it is scored with and the tuple of
+its row bitmasks, which is exact and hashes in C, so bots with other weights or
+boards of another width never share an entry. Results are kept in a bounded
+table that drops the least recently used entry once it is full. Hits, misses
+and evictions are counted so the size can be tuned.
+"""
+
+from collections import OrderedDict
+
+# returned by TranspositionTable.get on a miss
+MISSING = object()
+
+def board_key(masks, columns, weights, shapes):
+    """
+    Returns a hashable key for a board and the shapes still to place on it
+
+    Parameters
+    ----------
+    masks : list
+        bitmask of every row of the board
+    columns : int
+        width of the board
+    weights : tuple
+        hashable form of the weights the board is scored with
+    shapes : tuple or str
+        letters of the shapes the lookahead still places, () for the board
+        alone, or the letter of one shape for the boards it leaves
+
+    Returns
+    -------
+    tuple
+    """
+    return (columns, weights, tuple(masks), shapes)
+
+class TranspositionTable:
+    """
+    A class to remember search results, evicting the least recently used.
+
+    ...
+
+    Attributes
+    ----------
+    max_size : int
+        most entries kept
+    entries : OrderedDict
+        results by key, least recently used first
+    hits : int
+        lookups that found an entry
+    misses : int
+        lookups that found nothing
+    evictions : int
+        entries dropped to make room
+
+    Methods
+    -------
+    def get(key):
+        returns the entry for a key, or MISSING
+
+    def put(key, value):
+        stores an entry
+
+    def clear():
+        drops every entry and resets the counters
+
+    def stats():
+        returns the counters
+    """
+    def __init__(self, max_size = 65536):
+        """
+        Constructs all necessary attributes for the TranspositionTable class
+
+        Parameters
+        ----------
+        max_size : int
+            most entries kept
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """
+        Returns the number of entries
+
+        Returns
+        -------
+        int
+        """
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Returns the entry for a key and marks it as recently used
+
+        Parameters
+        ----------
+        key : hashable
+            key of the entry
+
+        Returns
+        -------
+        value, or MISSING if there is no entry
+        """
+        value = self.entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+
+        return value
+
+    def put(self, key, value):
+        """
+        Stores an entry, dropping the least recently used one if full
+
+        Parameters
+        ----------
+        key : hashable
+            key of the entry
+        value : object
+            result to remember
+
+        Returns
+        -------
+        None
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last = False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every entry and resets the counters
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        None
+        """
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Returns the counters
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        dict
+            size, max_size, hits, misses, evictions, and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }